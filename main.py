@@ -5,59 +5,97 @@ Automatically detects and runs either Round 1A or Round 1B based on input patter
 """
 
 import os
-import json
+import re
 import sys
 from pathlib import Path
+from collections import namedtuple
 import argparse
 
-# Import both round solutions
-from src.process_pdfs import process_pdf_to_outline
-from src.persona_intelligence import analyze_persona_intelligence
+# Only light modules are imported here. The round solutions (and with them
+# PyMuPDF, NumPy, ...) are imported by the code path that runs them, so a job
+# only pays for the round it runs; see --profile-startup
+from src.extraction_cache import configure_extraction_cache, configure_pool_worker, pool_worker_args
+from src.output_writer import OutputWriter, write_json_atomic
+from src.metrics import configure_metrics, summarize_metrics, write_prometheus
 
-def detect_input_type(input_dir):
+# Modules each mode imports on first use, for the --profile-startup report
+ROUND_MODULES = {
+    "round1a": ["src.process_pdfs"],
+    "round1b": ["src.persona_intelligence"],
+    "roundboth": ["src.document_model", "src.persona_intelligence"],
+    "serve": ["src.server"],
+}
+
+# Round 1B indicators: persona description files in the input directory
+PERSONA_INDICATORS = [
+    "persona.json", "persona.txt", "job_description.json",
+    "job_description.txt", "requirements.json", "requirements.txt"
+]
+
+# Known Round 1B collection names (directory or file names)
+COLLECTION_PATTERNS = [
+    "Collection 1", "Collection 2", "Collection 3",
+    "South of France", "Learn Acrobat", "Dinner Ideas", "Breakfast Ideas", "Lunch Ideas"
+]
+
+# One substring search per file name instead of one pass per pattern
+PERSONA_INDICATOR_MATCHER = re.compile("|".join(map(re.escape, PERSONA_INDICATORS)))
+COLLECTION_MATCHER = re.compile("|".join(map(re.escape, COLLECTION_PATTERNS)))
+
+PERSONA_DIR = "/app/persona"
+
+# Directory entry names and *.pdf paths of an input directory, see scan_input_dir
+InputListing = namedtuple("InputListing", ["names", "pdf_files"])
+
+def scan_input_dir(input_dir):
+    """
+    List input_dir once with os.scandir
+    Returns: InputListing of all entry names and the paths of the *.pdf entries,
+    in directory order (the same files and order as Path.glob("*.pdf"))
+    """
+    input_path = Path(input_dir)
+    names = []
+    pdf_files = []
+    with os.scandir(input_path) as entries:
+        for entry in entries:
+            names.append(entry.name)
+            if entry.name.endswith(".pdf"):
+                pdf_files.append(input_path / entry.name)
+    return InputListing(names, pdf_files)
+
+def has_persona_json(persona_dir=PERSONA_DIR):
+    """Whether persona_dir exists and contains a *.json entry (stops at the first one)"""
+    try:
+        with os.scandir(persona_dir) as entries:
+            return any(entry.name.endswith(".json") for entry in entries)
+    except OSError:
+        return False
+
+def detect_input_type(input_dir, listing=None):
     """
     Detect whether to run Round 1A or Round 1B based on input patterns
     
     Round 1A: Individual PDF files or simple PDF collections
     Round 1B: Collections with persona description files or known collection patterns
+    listing: InputListing of input_dir from scan_input_dir, to avoid listing it again
     """
     input_path = Path(input_dir)
-    
-    # Get all files in input directory
-    all_files = list(input_path.glob("*"))
-    pdf_files = list(input_path.glob("*.pdf"))
+    if listing is None:
+        listing = scan_input_dir(input_path)
     
     # Check for persona directory (as specified in test.md)
-    persona_dir = Path("/app/persona")
-    has_persona_dir = persona_dir.exists() and any(persona_dir.glob("*.json"))
+    has_persona_dir = has_persona_json()
     
     # Check for persona description files in input directory (Round 1B indicators)
-    persona_indicators = [
-        "persona.json", "persona.txt", "job_description.json", 
-        "job_description.txt", "requirements.json", "requirements.txt"
-    ]
-    
-    has_persona_file = any(
-        any(input_path.glob(f"*{indicator}*")) for indicator in persona_indicators
-    )
-    
-    # Check for known Round 1B collection patterns
-    collection_patterns = [
-        "Collection 1", "Collection 2", "Collection 3",
-        "South of France", "Learn Acrobat", "Dinner Ideas", "Breakfast Ideas", "Lunch Ideas"
-    ]
+    has_persona_file = any(PERSONA_INDICATOR_MATCHER.search(name) for name in listing.names)
     
     # Check if directory name or files suggest Round 1B collections
-    dir_name = input_path.name
-    is_known_collection = any(pattern in dir_name for pattern in collection_patterns)
+    is_known_collection = COLLECTION_MATCHER.search(input_path.name) is not None
     
     # Check file names for collection patterns
-    file_collection_match = any(
-        any(pattern in file.name for pattern in collection_patterns)
-        for file in all_files
-    )
+    file_collection_match = any(COLLECTION_MATCHER.search(name) for name in listing.names)
     
-    print(f"Analysis: {len(pdf_files)} PDFs found")
+    print(f"Analysis: {len(listing.pdf_files)} PDFs found")
     print(f"Has persona directory: {has_persona_dir}")
     print(f"Has persona file: {has_persona_file}")
     print(f"Known collection: {is_known_collection}")
@@ -71,13 +109,25 @@ def detect_input_type(input_dir):
         print("📋 Detected Round 1A: PDF outline extraction")
         return "round1a"
 
-def run_round1a(input_dir, output_dir):
-    """Run Round 1A: PDF outline extraction for each PDF"""
-    input_path = Path(input_dir)
+def save_outline(outline, output_file):
+    """Write a Round 1A outline to disk atomically (temp file + rename)"""
+    write_json_atomic(output_file, outline)
+
+def run_round1a(input_dir, output_dir, workers=1, streaming=False, page_workers=1, use_bookmarks=True,
+                title_only=False, compact_json=False, fast_json=False, budget=None, pdf_files=None):
+    """
+    Run Round 1A: PDF outline extraction for each PDF
+    With title_only=True only the title is extracted (first page only) and written as {"title": ...}
+    With a budget (resource_guard.ExtractionBudget) every PDF is extracted in a supervised
+    process and degrades to a partial outline instead of exceeding the budget
+    Outputs are written by a background OutputWriter so extraction never waits on storage
+    pdf_files: the PDFs of input_dir if already listed (see scan_input_dir)
+    """
     output_path = Path(output_dir)
     output_path.mkdir(exist_ok=True)
     
-    pdf_files = list(input_path.glob("*.pdf"))
+    if pdf_files is None:
+        pdf_files = scan_input_dir(input_dir).pdf_files
     
     if not pdf_files:
         print("❌ No PDF files found for Round 1A processing")
@@ -85,29 +135,121 @@ def run_round1a(input_dir, output_dir):
     
     print(f"🔄 Processing {len(pdf_files)} PDF files for Round 1A...")
     
+    with OutputWriter(compact=compact_json, fast=fast_json) as writer:
+        if workers > 1:
+            if page_workers > 1:
+                print("⚠️  --page-workers is ignored when --workers processes files in parallel")
+            run_round1a_parallel(pdf_files, output_path, workers, streaming, use_bookmarks, title_only, writer,
+                                 budget)
+        else:
+            run_round1a_serial(pdf_files, output_path, streaming, page_workers, use_bookmarks, title_only, writer,
+                               budget)
+    
+    if writer.errors:
+        print(f"❌ {len(writer.errors)} outputs could not be written")
+    
+    print("🎉 Round 1A processing completed!")
+    return True
+
+def run_round1a_serial(pdf_files, output_path, streaming, page_workers, use_bookmarks, title_only, writer,
+                       budget=None):
+    """Run Round 1A one PDF at a time, handing each outline to the background writer"""
+    from src.process_pdfs import process_pdf_to_outline, process_pdf_to_title
+    from src.resource_guard import process_pdf_guarded
+    
     for pdf_file in pdf_files:
         try:
             print(f"Processing: {pdf_file.name}")
             
             # Generate outline
-            outline = process_pdf_to_outline(str(pdf_file))
+            if title_only:
+                outline = process_pdf_to_title(str(pdf_file))
+            elif budget is not None:
+                outline = process_pdf_guarded(str(pdf_file), budget, use_bookmarks)
+            else:
+                outline = process_pdf_to_outline(str(pdf_file), streaming=streaming, page_workers=page_workers,
+                                                 use_bookmarks=use_bookmarks)
             
             # Save output with same name as PDF but .json extension
-            output_file = output_path / f"{pdf_file.stem}.json"
+            writer.submit(output_path / f"{pdf_file.stem}.json", outline)
             
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(outline, f, indent=2, ensure_ascii=False)
+        except Exception as e:
+            print(f"❌ Error processing {pdf_file.name}: {e}")
+
+def run_round1a_parallel(pdf_files, output_path, workers, streaming=False, use_bookmarks=True, title_only=False,
+                         writer=None, budget=None):
+    """
+    Run Round 1A with one PDF per task on a process pool
+    
+    Each outline is queued for writing as soon as its worker finishes. When a
+    worker process dies, the pool fails every unfinished document; those are
+    rerun one per fresh process, so only the document that crashed is lost.
+    """
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+    from concurrent.futures.process import BrokenProcessPool
+    from src.extraction_cache import run_in_worker_process
+    from src.process_pdfs import process_pdf_to_outline, process_pdf_to_title
+    from src.resource_guard import process_pdf_guarded
+    
+    print(f"⚡ Using {workers} worker processes")
+    
+    guarded = budget is not None and not title_only
+    if title_only:
+        tasks = {pdf_file: (process_pdf_to_title, str(pdf_file)) for pdf_file in pdf_files}
+    elif guarded:
+        tasks = {pdf_file: (process_pdf_guarded, str(pdf_file), budget, use_bookmarks) for pdf_file in pdf_files}
+    else:
+        tasks = {pdf_file: (process_pdf_to_outline, str(pdf_file), streaming, 1, use_bookmarks)
+                 for pdf_file in pdf_files}
+    
+    if guarded:
+        # process_pdf_guarded starts its own supervised process per PDF
+        executor = ThreadPoolExecutor(max_workers=workers)
+    else:
+        # Workers share the parent's on-disk extraction cache and metrics file, if any
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=configure_pool_worker,
+                                       initargs=pool_worker_args())
+    
+    def save_result(pdf_file, future):
+        try:
+            outline = future.result()
             
-            print(f"✅ Saved: {output_file.name}")
+            output_file = output_path / f"{pdf_file.stem}.json"
+            if writer is not None:
+                writer.submit(output_file, outline)
+            else:
+                save_outline(outline, output_file)
+                print(f"✅ Saved: {output_file.name}")
             
         except Exception as e:
             print(f"❌ Error processing {pdf_file.name}: {e}")
     
-    print("🎉 Round 1A processing completed!")
-    return True
+    unfinished = []  # documents failed by a dead worker, not necessarily their own
+    with executor:
+        futures = {executor.submit(*tasks[pdf_file]): pdf_file for pdf_file in pdf_files}
+        for future in as_completed(futures):
+            if isinstance(future.exception(), BrokenProcessPool):
+                unfinished.append(futures[future])
+            else:
+                save_result(futures[future], future)
+    
+    if unfinished:
+        print(f"⚠️  A worker process died; rerunning {len(unfinished)} unfinished documents one per process")
+        with ThreadPoolExecutor(max_workers=workers) as retry_executor:
+            futures = {
+                retry_executor.submit(run_in_worker_process, *tasks[pdf_file]): pdf_file for pdf_file in unfinished
+            }
+            for future in as_completed(futures):
+                save_result(futures[future], future)
 
-def run_round1b(input_dir, output_dir):
-    """Run Round 1B: Persona-driven document intelligence"""
+def run_round1b(input_dir, output_dir, index_path=None, ranking="keyword", top_k=None, segmentation="page",
+                pdf_files=None, dedupe=False):
+    """
+    Run Round 1B: Persona-driven document intelligence
+    pdf_files: the PDFs of input_dir if already listed (see scan_input_dir)
+    """
+    from src.persona_intelligence import analyze_persona_intelligence
+    
     output_path = Path(output_dir)
     output_path.mkdir(exist_ok=True)
     
@@ -115,7 +257,9 @@ def run_round1b(input_dir, output_dir):
         print("🧠 Running Round 1B: Persona-driven document intelligence...")
         
         # Run persona intelligence analysis
-        result = analyze_persona_intelligence(input_dir, output_dir)
+        result = analyze_persona_intelligence(input_dir, output_dir, index_path=index_path, ranking=ranking,
+                                              top_k=top_k, segmentation=segmentation, pdf_files=pdf_files,
+                                              dedupe=dedupe)
         
         if result:
             print("🎉 Round 1B processing completed!")
@@ -128,46 +272,260 @@ def run_round1b(input_dir, output_dir):
         print(f"❌ Error in Round 1B processing: {e}")
         return False
 
+def run_round1b_batch(root_dir, output_dir, workers=1, index_path=None, ranking="keyword", top_k=None,
+                      segmentation="page", dedupe=False):
+    """
+    Run Round 1B for every collection under root_dir in one process (see src/batch.py)
+    Outputs go to <output_dir>/<collection name>/persona_intelligence_output.json
+    """
+    from src.batch import analyze_collections
+    
+    try:
+        print("🧠 Running Round 1B in batch mode...")
+        if not analyze_collections(root_dir, output_dir, workers=workers, ranking=ranking, top_k=top_k,
+                                   segmentation=segmentation, index_path=index_path, dedupe=dedupe):
+            print("❌ Round 1B batch processing failed")
+            return False
+    except Exception as e:
+        print(f"❌ Error in Round 1B batch processing: {e}")
+        return False
+    
+    print("🎉 Round 1B batch processing completed!")
+    return True
+
+def run_both_rounds(input_dir, output_dir, use_bookmarks=True, ranking="keyword", top_k=None,
+                    segmentation="page", pdf_files=None, dedupe=False):
+    """
+    Run Round 1A and Round 1B on the same PDFs, parsing each PDF only once
+    Outlines go to <pdf stem>.json and the persona analysis to
+    persona_intelligence_output.json in the same output directory
+    pdf_files: the PDFs of input_dir if already listed (see scan_input_dir)
+    """
+    from src.document_model import parse_document
+    from src.persona_intelligence import analyze_persona_intelligence
+    
+    output_path = Path(output_dir)
+    output_path.mkdir(exist_ok=True)
+    
+    if pdf_files is None:
+        pdf_files = scan_input_dir(input_dir).pdf_files
+    
+    if not pdf_files:
+        print("❌ No PDF files found for processing")
+        return False
+    
+    print(f"🔄 Parsing {len(pdf_files)} PDF files once for both rounds...")
+    
+    documents = []
+    for pdf_file in pdf_files:
+        print(f"Processing: {pdf_file.name}")
+        try:
+            document = parse_document(str(pdf_file))
+            documents.append(document)
+            outline = document.outline(use_bookmarks=use_bookmarks)
+            output_file = output_path / f"{pdf_file.stem}.json"
+            save_outline(outline, output_file)
+            print(f"✅ Saved: {output_file.name}")
+        except Exception as e:
+            print(f"❌ Error processing {pdf_file.name}: {e}")
+    
+    print("🎉 Round 1A processing completed!")
+    
+    try:
+        print("🧠 Running Round 1B: Persona-driven document intelligence...")
+        if not analyze_persona_intelligence(input_dir, output_dir, parsed_documents=documents, ranking=ranking,
+                                            top_k=top_k, segmentation=segmentation, dedupe=dedupe):
+            print("❌ Round 1B processing failed")
+            return False
+    except Exception as e:
+        print(f"❌ Error in Round 1B processing: {e}")
+        return False
+    
+    print("🎉 Round 1B processing completed!")
+    return True
+
+def report_metrics(metrics_path, prometheus_path=None):
+    """Print the slowest documents of a metrics file and optionally write the Prometheus dump"""
+    configure_metrics(None)
+    summary = summarize_metrics(metrics_path)
+    
+    print(f"\n📈 Metrics: {summary['documents']} documents, {summary['pages']} pages, {summary['spans']} spans")
+    for document, seconds in summary["slowest"]:
+        print(f"  🐢 {seconds:.3f}s  {os.path.basename(document)}")
+    
+    if prometheus_path:
+        write_prometheus(metrics_path, prometheus_path)
+        print(f"📈 Prometheus metrics: {prometheus_path}")
+
 def main():
     """Main entry point for unified solution"""
     parser = argparse.ArgumentParser(description='Adobe Hackathon Unified Solution')
     parser.add_argument('--input', default='/app/input', help='Input directory path')
     parser.add_argument('--output', default='/app/output', help='Output directory path')
-    parser.add_argument('--force-round', choices=['1a', '1b'], help='Force specific round')
+    parser.add_argument('--force-round', choices=['1a', '1b', 'both'],
+                        help='Force specific round ("both" parses each PDF once for 1A and 1B)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of worker processes for Round 1A (default: 1, serial)')
+    parser.add_argument('--page-workers', type=int, default=1,
+                        help='Round 1A: extract page ranges of large PDFs in N worker processes')
+    parser.add_argument('--streaming', action='store_true',
+                        help='Round 1A: process one page at a time so memory does not grow with page count')
+    parser.add_argument('--title-only', action='store_true',
+                        help='Round 1A: only extract titles (reads the first page of each PDF)')
+    parser.add_argument('--compact-json', action='store_true',
+                        help='Round 1A: write outputs without indentation')
+    parser.add_argument('--fast-json', action='store_true',
+                        help='Round 1A: encode outputs with orjson when it is installed')
+    parser.add_argument('--ignore-bookmarks', action='store_true',
+                        help='Round 1A: always use font heuristics, even for PDFs with an embedded outline')
+    parser.add_argument('--doc-timeout', type=float,
+                        help='Round 1A: seconds per PDF before degrading to a partial outline (enables the guard)')
+    parser.add_argument('--page-timeout', type=float,
+                        help='Round 1A: seconds a single page may take before degrading (enables the guard)')
+    parser.add_argument('--doc-memory-mb', type=int,
+                        help='Round 1A: address space limit per PDF, including the interpreter (~200 MB)')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep running and only reprocess added or changed PDFs')
+    parser.add_argument('--watch-interval', type=float, default=2.0,
+                        help='Seconds between input directory scans in watch mode (default: 2)')
+    parser.add_argument('--index-file',
+                        help='Round 1B: persisted page index reused across runs on the same collection')
+    parser.add_argument('--ranking', choices=['keyword', 'bm25'], default='keyword',
+                        help='Round 1B: section ranking (default: keyword scores; bm25 uses the page index)')
+    parser.add_argument('--top-k', type=int,
+                        help='Round 1B: only output the K most relevant sections')
+    parser.add_argument('--batch', action='store_true',
+                        help='Round 1B: --input holds one directory per collection (e.g. Collection 1/PDFs); '
+                             'analyze all of them in one run, with --workers extraction processes')
+    parser.add_argument('--segmentation', choices=['page', 'heading'], default='page',
+                        help='Round 1B: score whole pages (default) or heading-bounded sections')
+    parser.add_argument('--dedupe-pages', action='store_true',
+                        help='Round 1B: score exact and near-duplicate pages once and list them under the '
+                             'section they collapse into')
+    parser.add_argument('--cache-dir', help='Directory for the extraction cache (disabled if omitted)')
+    parser.add_argument('--cache-max-mb', type=int, default=1024,
+                        help='Size limit of the extraction cache in MB (default: 1024)')
+    parser.add_argument('--metrics', help='Write per-stage timings, page/span counts and cache lookups '
+                                          'as JSON lines to this file')
+    parser.add_argument('--prometheus', help='Also write a Prometheus text-format summary (requires --metrics)')
+    parser.add_argument('--serve', nargs='?', const='', metavar='ADDRESS',
+                        help='Run as a service on HOST:PORT or unix:PATH (default: 127.0.0.1:8080) '
+                             'with --workers warm worker processes; --input/--output are not used')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='Report import times of main.py and of the round it would run (--force-round, '
+                             'default 1a) and exit; exit status 1 if main.py exceeds its startup budget')
     
     args = parser.parse_args()
+    if args.top_k is not None and args.top_k < 1:
+        parser.error("--top-k must be at least 1")
+    if args.prometheus and not args.metrics:
+        parser.error("--prometheus requires --metrics")
+    if args.batch and (args.watch or args.force_round):
+        parser.error("--batch cannot be combined with --watch or --force-round")
+    if args.watch and args.workers > 1:
+        parser.error("--watch processes changed PDFs one at a time; --workers is not supported")
+    if args.watch and (args.ranking != 'keyword' or args.segmentation != 'page' or args.dedupe_pages
+                       or args.index_file):
+        # Round 1B watch mode ranks from per-page keyword summaries (see src/incremental.py)
+        parser.error("--watch only supports keyword ranking of whole pages; --ranking bm25, "
+                     "--segmentation heading, --dedupe-pages and --index-file cannot be combined with it")
+    
+    if args.profile_startup:
+        from src.startup_profile import print_startup_profile
+        round_type = f"round{args.force_round}" if args.force_round else "round1a"
+        sys.exit(0 if print_startup_profile(ROUND_MODULES[round_type], round_type) else 1)
     
+    serving = args.serve is not None
     input_dir = args.input
     output_dir = args.output
     
     # Validate input directory
-    if not os.path.exists(input_dir):
+    if not serving and not os.path.exists(input_dir):
         print(f"❌ Input directory not found: {input_dir}")
         sys.exit(1)
     
     print("🚀 Adobe India Hackathon - Unified Solution")
-    print(f"📁 Input: {input_dir}")
-    print(f"📁 Output: {output_dir}")
+    if not serving:
+        print(f"📁 Input: {input_dir}")
+        print(f"📁 Output: {output_dir}")
+    if args.cache_dir:
+        configure_extraction_cache(args.cache_dir, args.cache_max_mb * 1024 * 1024)
+        print(f"🗄️  Extraction cache: {args.cache_dir}")
+    if args.metrics:
+        configure_metrics(args.metrics)
+        print(f"📈 Metrics: {args.metrics}")
+    
     print("-" * 50)
     
+    if serving:
+        # Requests name their own inputs; workers share the cache and metrics configured above
+        from src.server import serve
+        serve(args.serve or None, workers=args.workers)
+        sys.exit(0)
+    
+    # List the input directory once; detection and the runners share the listing
+    listing = scan_input_dir(input_dir)
+    
     # Detect which round to run (unless forced)
-    if args.force_round:
+    if args.batch:
+        round_type = "batch"
+        print("📚 Batch mode: Round 1B for every collection in the input directory")
+    elif args.force_round:
         round_type = f"round{args.force_round}"
         print(f"🔧 Forced to run {round_type.upper()}")
     else:
-        round_type = detect_input_type(input_dir)
+        round_type = detect_input_type(input_dir, listing)
     
     print("-" * 50)
     
+    budget = None
+    if args.doc_timeout is not None or args.page_timeout is not None or args.doc_memory_mb is not None:
+        from src.resource_guard import make_budget
+        budget = make_budget(args.doc_timeout, args.page_timeout, args.doc_memory_mb)
+        print(f"⏱️  Per-document budget: {budget.document_seconds:g}s, {budget.page_seconds:g}s per page"
+              + (f", {budget.memory_mb} MB" if budget.memory_mb else ""))
+    
     # Run appropriate solution
-    if round_type == "round1a":
-        success = run_round1a(input_dir, output_dir)
+    if args.watch:
+        if round_type == "roundboth":
+            print("❌ Watch mode runs a single round; use --force-round 1a or 1b")
+            sys.exit(1)
+        from src.incremental import watch_directory
+        round1a_options = {
+            "title_only": args.title_only,
+            "use_bookmarks": not args.ignore_bookmarks,
+            "streaming": args.streaming,
+            "page_workers": args.page_workers,
+            "budget": budget,
+            "compact_json": args.compact_json,
+            "fast_json": args.fast_json
+        }
+        success = watch_directory(input_dir, output_dir, round_type, interval=args.watch_interval,
+                                  top_k=args.top_k, round1a_options=round1a_options)
+    elif round_type == "round1a":
+        success = run_round1a(input_dir, output_dir, workers=args.workers, streaming=args.streaming,
+                              page_workers=args.page_workers, use_bookmarks=not args.ignore_bookmarks,
+                              title_only=args.title_only, compact_json=args.compact_json,
+                              fast_json=args.fast_json, budget=budget, pdf_files=listing.pdf_files)
     elif round_type == "round1b":
-        success = run_round1b(input_dir, output_dir)
+        success = run_round1b(input_dir, output_dir, index_path=args.index_file, ranking=args.ranking,
+                              top_k=args.top_k, segmentation=args.segmentation, pdf_files=listing.pdf_files,
+                              dedupe=args.dedupe_pages)
+    elif round_type == "batch":
+        success = run_round1b_batch(input_dir, output_dir, workers=args.workers, index_path=args.index_file,
+                                    ranking=args.ranking, top_k=args.top_k, segmentation=args.segmentation,
+                                    dedupe=args.dedupe_pages)
+    elif round_type == "roundboth":
+        success = run_both_rounds(input_dir, output_dir, use_bookmarks=not args.ignore_bookmarks,
+                                  ranking=args.ranking, top_k=args.top_k, segmentation=args.segmentation,
+                                  pdf_files=listing.pdf_files, dedupe=args.dedupe_pages)
     else:
         print("❌ Unknown round type detected")
         sys.exit(1)
     
+    if args.metrics:
+        report_metrics(args.metrics, args.prometheus)
+    
     if success:
         print("\n🏆 Processing completed successfully!")
         sys.exit(0)
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for Adobe India Hackathon Round 1A and Round 1B
+Measures per-stage timings, throughput and memory over the sample datasets
+and compares them against a saved baseline.
+
+Usage:
+    python scripts/benchmark.py                              # report only
+    python scripts/benchmark.py --save-baseline bench.json   # record a baseline
+    python scripts/benchmark.py --baseline bench.json --threshold 25
+"""
+
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+# Add the src directory to Python path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+import process_pdfs
+import persona_intelligence
+from pdf_source import PDFSource
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Each stage times one production entry point (no extraction cache is configured)
+STAGES = [
+    "open",                    # PDFSource + open_fitz, shared by the next two stages as in process_pdf_to_outline
+    "bookmarks",               # process_pdfs.bookmark_outline
+    "span_extraction",         # process_pdfs.load_span_store on the open document
+    "font_statistics",         # process_pdfs.font_statistics(count_font_sizes(...))
+    "heading_classification",  # process_pdfs.outline_from_pages (title + extract_headings)
+    "text_extraction",         # persona_intelligence.extract_text_from_pdf
+    "persona_scoring",         # persona_intelligence.extract_sections_and_analyze, every persona
+    "json_write",              # process_pdfs.save_json
+]
+
+# Stages faster than this (in total) are too noisy to flag as regressions
+DEFAULT_MIN_SECONDS = 0.005
+
+def discover_pdfs(project_root=PROJECT_ROOT):
+    """Sample PDFs from the Round 1A dataset and every Round 1B collection"""
+    dataset = Path(project_root) / "Dataset"
+    pdf_files = sorted((dataset / "Challenge _1(a)" / "Datasets" / "Pdfs").glob("*.pdf"))
+    pdf_files += sorted((dataset / "Challenge_1b").glob("*/PDFs/*.pdf"))
+    return pdf_files
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KB (None where unsupported)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS reports bytes
+
+def benchmark_document(pdf_path, output_dir):
+    """
+    Run the pipeline's entry points on one PDF, timing each stage separately
+    The stages run the same functions as main.py, so changes to PDFSource, the
+    span extraction or the heading classifier show up in their numbers. Like
+    process_pdf_to_outline, bookmarks and span extraction share one opened
+    document; text extraction opens the PDF itself. font_statistics is also
+    computed inside outline_from_pages, so heading_classification includes it.
+    Returns: {"file", "pages", "spans", "stages": {stage: seconds}}
+    """
+    timings = dict.fromkeys(STAGES, 0.0)
+    pdf_path = str(pdf_path)
+
+    start = time.perf_counter()
+    source = PDFSource(pdf_path)
+    doc = source.open_fitz()
+    timings["open"] = time.perf_counter() - start
+
+    try:
+        start = time.perf_counter()
+        bookmark_outline = process_pdfs.bookmark_outline(doc)
+        timings["bookmarks"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store = process_pdfs.load_span_store(pdf_path, source=source, doc=doc)
+        timings["span_extraction"] = time.perf_counter() - start
+    finally:
+        doc.close()
+        source.close()
+
+    start = time.perf_counter()
+    process_pdfs.font_statistics(process_pdfs.count_font_sizes(store.iter_pages()))
+    timings["font_statistics"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    outline = process_pdfs.outline_from_pages(store)
+    timings["heading_classification"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pages_text = persona_intelligence.extract_text_from_pdf(pdf_path)
+    timings["text_extraction"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for persona_name in persona_intelligence.PERSONA_DEFINITIONS:
+        persona_intelligence.extract_sections_and_analyze([pages_text], persona_name)
+    timings["persona_scoring"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    process_pdfs.save_json(Path(output_dir) / f"{Path(pdf_path).stem}.json", bookmark_outline or outline)
+    timings["json_write"] = time.perf_counter() - start
+
+    return {
+        "file": Path(pdf_path).name,
+        "pages": len(store),
+        "spans": store.span_count,
+        "stages": timings
+    }
+
+def run_benchmark(pdf_files, repeat=3):
+    """
+    Benchmark every PDF `repeat` times, keeping the fastest run per document
+    Returns the report dict saved as a baseline
+    """
+    documents = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        for pdf_file in pdf_files:
+            runs = [benchmark_document(pdf_file, output_dir) for _ in range(repeat)]
+            documents.append(min(runs, key=lambda run: sum(run["stages"].values())))
+
+        # Separate pass so tracing overhead does not distort the timings
+        tracemalloc.start()
+        for pdf_file in pdf_files:
+            benchmark_document(pdf_file, output_dir)
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    stages = {stage: sum(doc["stages"][stage] for doc in documents) for stage in STAGES}
+    total_seconds = sum(stages.values())
+    total_pages = sum(doc["pages"] for doc in documents)
+
+    return {
+        "documents": documents,
+        "stages": stages,
+        "total_seconds": total_seconds,
+        "total_pages": total_pages,
+        "pages_per_second": total_pages / total_seconds if total_seconds else 0.0,
+        "peak_rss_kb": peak_rss_kb(),
+        "tracemalloc_peak_bytes": traced_peak
+    }
+
+def find_regressions(report, baseline, threshold_pct, min_seconds=DEFAULT_MIN_SECONDS):
+    """
+    Stages slower than baseline by more than threshold_pct percent
+    Returns: list of (stage, baseline_seconds, current_seconds)
+    """
+    regressions = []
+    for stage in STAGES:
+        previous = baseline["stages"].get(stage)
+        current = report["stages"][stage]
+        if previous is None or max(previous, current) < min_seconds:
+            continue
+        if current > previous * (1 + threshold_pct / 100):
+            regressions.append((stage, previous, current))
+    return regressions
+
+def print_report(report):
+    """Human-readable summary of a benchmark report"""
+    print(f"📄 {len(report['documents'])} documents, {report['total_pages']} pages")
+    print("------------------------------")
+    for stage in STAGES:
+        print(f"  {stage:<24}{report['stages'][stage] * 1000:10.1f} ms")
+    print("------------------------------")
+    print(f"  {'total':<24}{report['total_seconds'] * 1000:10.1f} ms")
+    print(f"⚡ Throughput: {report['pages_per_second']:.1f} pages/s")
+    if report["peak_rss_kb"] is not None:
+        print(f"🧠 Peak RSS: {report['peak_rss_kb'] / 1024:.1f} MB")
+    print(f"🧠 Peak traced allocations: {report['tracemalloc_peak_bytes'] / 1024 / 1024:.1f} MB")
+
+def main():
+    """Main benchmark entry point"""
+    parser = argparse.ArgumentParser(description='Per-stage benchmark over the sample datasets')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per document; the fastest is kept')
+    parser.add_argument('--save-baseline', help='Write the report to this JSON file')
+    parser.add_argument('--baseline', help='Compare against a previously saved report')
+    parser.add_argument('--threshold', type=float, default=20.0,
+                        help='Allowed slowdown per stage in percent (default: 20)')
+    parser.add_argument('--min-seconds', type=float, default=DEFAULT_MIN_SECONDS,
+                        help='Ignore stages faster than this in both runs (default: 0.005)')
+    args = parser.parse_args()
+
+    print("⏱️  Benchmark: PDF Outline Extractor + Persona Intelligence")
+    print("==================================================")
+
+    pdf_files = discover_pdfs()
+    if not pdf_files:
+        print("❌ No sample PDFs found under Dataset/")
+        sys.exit(1)
+
+    report = run_benchmark(pdf_files, repeat=args.repeat)
+    print_report(report)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"📁 Baseline saved to: {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = find_regressions(report, baseline, args.threshold, args.min_seconds)
+        if regressions:
+            for stage, previous, current in regressions:
+                print(f"❌ {stage} regressed: {previous * 1000:.1f} ms -> {current * 1000:.1f} ms")
+            sys.exit(1)
+        print(f"✅ No stage regressed by more than {args.threshold:.0f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Batch Round 1B over many collections in one process
+
+A root directory holds one subdirectory per collection, laid out like
+Dataset/Challenge_1b:
+
+    <root>/Collection 1/PDFs/*.pdf
+    <root>/Collection 1/challenge1b_input.json   (optional persona/job spec)
+
+(PDFs directly inside the collection directory work too.) analyze_collections
+replaces one launch of analyze_persona_intelligence per collection:
+
+- the PDFs of all collections are extracted together, on a process pool
+  with workers > 1
+- one PageIndex over every collection tokenises each page once, and one
+  BM25Ranker over it gives all collections the same IDF and average length
+  statistics; each persona is scored once over the whole corpus and every
+  collection reads the slice of its own pages (with BM25, once per persona
+  and job, since the job text is part of the query)
+- persona detection and the output stay per collection:
+  <output>/<collection name>/persona_intelligence_output.json
+
+With keyword ranking every output is the same as running the collection on
+its own. BM25 scores use the corpus-wide statistics.
+"""
+
+import re
+import json
+from pathlib import Path
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from .extraction_cache import configure_pool_worker, pool_worker_args
+    from .metrics import timer
+    from .bm25 import BM25Ranker
+    from .page_index import PageIndex
+    from .sections import extract_sections_from_pdf
+    from .persona_intelligence import (
+        PERSONA_DEFINITIONS, PERSONA_DISPLAY_NAMES, PERSONA_MATCHER, extract_text_from_pdf, detect_persona,
+        display_persona_name, persona_page_scores, extract_sections_and_analyze, build_persona_output,
+        save_persona_output, load_or_build_index, generate_job_to_be_done
+    )
+except ImportError:
+    from extraction_cache import configure_pool_worker, pool_worker_args
+    from metrics import timer
+    from bm25 import BM25Ranker
+    from page_index import PageIndex
+    from sections import extract_sections_from_pdf
+    from persona_intelligence import (
+        PERSONA_DEFINITIONS, PERSONA_DISPLAY_NAMES, PERSONA_MATCHER, extract_text_from_pdf, detect_persona,
+        display_persona_name, persona_page_scores, extract_sections_and_analyze, build_persona_output,
+        save_persona_output, load_or_build_index, generate_job_to_be_done
+    )
+
+# Persona/job spec files looked for in a collection directory, first match wins
+SPEC_FILES = ["challenge1b_input.json", "persona.json", "job_description.json"]
+
+# One collection found by discover_collections; spec is {"persona", "job_to_be_done"} (either may be None)
+Collection = namedtuple("Collection", ["name", "pdf_files", "spec"])
+
+def natural_key(name):
+    """Sort key that orders Collection 2 before Collection 10"""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', name)]
+
+def spec_text(value, key):
+    """A spec field given as a string or as {key: string} (challenge1b_input.json layout)"""
+    if isinstance(value, dict):
+        value = value.get(key)
+    return value.strip() if isinstance(value, str) and value.strip() else None
+
+def load_collection_spec(collection_dir):
+    """Persona role and job task from the first spec file of a collection directory"""
+    for name in SPEC_FILES:
+        spec_file = Path(collection_dir) / name
+        if not spec_file.is_file():
+            continue
+        try:
+            with open(spec_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring unreadable spec {spec_file}: {e}")
+            continue
+        if isinstance(data, dict):
+            return {
+                "persona": spec_text(data.get("persona"), "role"),
+                "job_to_be_done": spec_text(data.get("job_to_be_done"), "task")
+            }
+    return {"persona": None, "job_to_be_done": None}
+
+def discover_collections(root_dir):
+    """
+    Every subdirectory of root_dir with PDFs (in PDFs/ or directly inside), in natural name order
+    Returns: list of Collection
+    """
+    collections = []
+    for directory in sorted(Path(root_dir).iterdir(), key=lambda path: natural_key(path.name)):
+        if not directory.is_dir():
+            continue
+        pdf_dir = directory / "PDFs" if (directory / "PDFs").is_dir() else directory
+        pdf_files = list(pdf_dir.glob("*.pdf"))
+        if pdf_files:
+            collections.append(Collection(directory.name, pdf_files, load_collection_spec(directory)))
+    return collections
+
+def persona_from_role(role):
+    """Internal persona name for a spec's role ("Travel Planner" -> "travel_planner"), or None"""
+    if not role:
+        return None
+    role = role.strip().lower()
+    for persona_name, display_name in PERSONA_DISPLAY_NAMES.items():
+        if role in (persona_name, display_name.lower()):
+            return persona_name
+    return None
+
+def extract_collection_texts(collections, segmentation="page", workers=1):
+    """
+    Page (or heading section) lists of every PDF of every collection
+    Returns: one documents_text list per collection
+    """
+    extract = extract_sections_from_pdf if segmentation == "heading" else extract_text_from_pdf
+    pdf_files = [pdf_file for collection in collections for pdf_file in collection.pdf_files]
+
+    if workers > 1 and len(pdf_files) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=configure_pool_worker,
+                                 initargs=pool_worker_args()) as executor:
+            texts = list(executor.map(extract, pdf_files))
+    else:
+        texts = [extract(pdf_file) for pdf_file in pdf_files]
+
+    documents_by_collection = []
+    start = 0
+    for collection in collections:
+        documents_by_collection.append(texts[start:start + len(collection.pdf_files)])
+        start += len(collection.pdf_files)
+    return documents_by_collection
+
+def indexed_page_count(documents_text):
+    """Number of pages PageIndex.build indexes for documents_text (the non-empty ones)"""
+    return sum(1 for doc_pages in documents_text for page in doc_pages if page["text"].strip())
+
+def analyze_collections(root_dir, output_dir, workers=1, ranking="keyword", top_k=None, segmentation="page",
+                        index_path=None, dedupe=False):
+    """
+    Round 1B for every collection under root_dir, sharing extraction and corpus statistics
+    index_path: optional file for the persisted PageIndex of all collections together
+    dedupe: collapse duplicate pages within each collection (see extract_sections_and_analyze)
+    Returns: True if every collection was analyzed
+    """
+    collections = discover_collections(root_dir)
+    if not collections:
+        print(f"❌ No collections with PDF files found in {root_dir}")
+        return False
+
+    total_pdfs = sum(len(collection.pdf_files) for collection in collections)
+    print(f"🔄 Extracting {total_pdfs} PDFs from {len(collections)} collections...")
+    documents_by_collection = extract_collection_texts(collections, segmentation, workers)
+
+    all_documents = [doc_pages for documents_text in documents_by_collection for doc_pages in documents_text]
+    with timer("index"):
+        if index_path:
+            index = load_or_build_index(all_documents, index_path)
+        else:
+            index = PageIndex.build(all_documents, PERSONA_MATCHER)
+    ranker = BM25Ranker(index) if ranking == "bm25" else None
+
+    corpus_scores = {}  # (persona, job) -> persona_page_scores over all collections
+    page_offset = 0
+    output_root = Path(output_dir)
+    success = True
+
+    for collection, documents_text in zip(collections, documents_by_collection):
+        page_count = indexed_page_count(documents_text)
+        document_names = [pdf_file.name for pdf_file in collection.pdf_files]
+        print(f"\n📚 {collection.name}: {len(document_names)} documents")
+
+        with timer("persona_detection"):
+            persona_name, persona_scores = detect_persona(documents_text)
+        spec_persona = persona_from_role(collection.spec["persona"])
+        if spec_persona is not None:
+            persona_name = spec_persona
+        elif collection.spec["persona"]:
+            print(f"⚠️  Unknown persona in spec: {collection.spec['persona']}, using the detected one")
+        print(f"🎯 Persona: {display_persona_name(persona_name)}")
+
+        job_to_be_done = collection.spec["job_to_be_done"] or generate_job_to_be_done(persona_name, document_names)
+        page_scores = None
+        if persona_name in PERSONA_DEFINITIONS:
+            # Keyword scores ignore the job, so every collection of a persona shares them
+            scores_key = (persona_name, job_to_be_done if ranking == "bm25" else None)
+            if scores_key not in corpus_scores:
+                corpus_scores[scores_key] = persona_page_scores(index, persona_name, ranking, ranker, job_to_be_done)
+            page_scores = corpus_scores[scores_key][page_offset:page_offset + page_count]
+        page_offset += page_count
+
+        try:
+            with timer("scoring"):
+                extracted_sections, subsection_analysis = extract_sections_and_analyze(
+                    documents_text, persona_name, ranking=ranking, top_k=top_k, page_scores=page_scores,
+                    dedupe=dedupe
+                )
+            output_data = build_persona_output(document_names, persona_name, persona_scores, extracted_sections,
+                                               subsection_analysis, job_to_be_done)
+            collection_output = output_root / collection.name
+            collection_output.mkdir(parents=True, exist_ok=True)
+            output_file = save_persona_output(collection_output, output_data)
+            print(f"✅ {len(extracted_sections)} sections saved to {output_file}")
+        except Exception as e:
+            print(f"❌ Error analyzing {collection.name}: {e}")
+            success = False
+
+    return success
@@ -0,0 +1,106 @@
+"""
+BM25 ranking of Round 1B pages over a PageIndex
+
+The index's token postings are turned into a sparse term x page matrix in
+CSR layout (one row per term: page ids and precomputed BM25 weights), so a
+query is scored against every page of the collection in one pass:
+
+    score(page) = sum over query terms t of  qtf(t) * idf(t) * tf * (k1 + 1)
+                                             / (tf + k1 * (1 - b + b * len / avg_len))
+
+With NumPy the pass is a single bincount over the concatenated query rows
+(a sparse matrix-vector product); without it the same sums are accumulated
+in a plain loop.
+"""
+
+import math
+from array import array
+from collections import Counter
+
+try:
+    import numpy as np  # optional: vectorised scoring
+except ImportError:
+    np = None
+
+try:
+    from .page_index import TOKEN_PATTERN
+except ImportError:
+    from page_index import TOKEN_PATTERN
+
+DEFAULT_K1 = 1.2
+DEFAULT_B = 0.75
+
+# Job-to-be-done words that say nothing about a page's content (function words
+# and the filler of generate_job_to_be_done's templates)
+JOB_STOPWORDS = frozenset("""
+    a an and are as at be by for from in into is it of on or our the their this to with
+    across analyze comprehensive documents extract information insights using
+""".split())
+
+def persona_query(persona_data, job=None):
+    """
+    Query term frequencies of a persona: tokens of its keywords and priority sections
+    job: optional job-to-be-done text whose content words are added to the query
+    """
+    terms = Counter()
+    for phrase in persona_data["keywords"] + persona_data["priority_sections"]:
+        terms.update(TOKEN_PATTERN.findall(phrase.lower()))
+    if job:
+        terms.update(
+            token for token in TOKEN_PATTERN.findall(job.lower())
+            if token not in JOB_STOPWORDS and not token.isdigit()
+        )
+    return terms
+
+class BM25Ranker:
+    """BM25 weights of every (term, page) pair of a PageIndex, stored row-per-term"""
+
+    def __init__(self, index, k1=DEFAULT_K1, b=DEFAULT_B):
+        self.page_count = len(index.pages)
+        self.term_rows = {}              # term -> row number
+        self.indptr = array('q', [0])    # row start offsets into page_ids / weights
+        self.page_ids = array('i')
+        self.weights = array('d')
+
+        average_length = index.average_page_length or 1.0
+        # Length normalisation depends only on the page, so compute it once per page
+        norms = [k1 * (1 - b + b * page["length"] / average_length) for page in index.pages]
+
+        for term, postings in index.token_postings.items():
+            # Lucene-style idf, which stays positive even for terms on most pages
+            idf = math.log(1 + (self.page_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            self.term_rows[term] = len(self.indptr) - 1
+            for page_id, tf in postings:
+                self.page_ids.append(page_id)
+                self.weights.append(idf * tf * (k1 + 1) / (tf + norms[page_id]))
+            self.indptr.append(len(self.page_ids))
+
+        if np is not None:
+            self._page_ids = np.frombuffer(self.page_ids, dtype=np.int32)
+            self._weights = np.frombuffer(self.weights, dtype=np.float64)
+
+    def score(self, query_terms):
+        """
+        BM25 score of every page for a {term: query frequency} mapping
+        Returns: list of floats indexed by page id
+        """
+        rows = [
+            (self.indptr[row], self.indptr[row + 1], weight)
+            for row, weight in (
+                (self.term_rows.get(term), weight) for term, weight in query_terms.items()
+            )
+            if row is not None
+        ]
+
+        if np is not None:
+            if not rows:
+                return [0.0] * self.page_count
+            ids = np.concatenate([self._page_ids[start:end] for start, end, _ in rows])
+            weights = np.concatenate([self._weights[start:end] * weight for start, end, weight in rows])
+            return np.bincount(ids, weights=weights, minlength=self.page_count).tolist()
+
+        scores = [0.0] * self.page_count
+        for start, end, weight in rows:
+            for position in range(start, end):
+                scores[self.page_ids[position]] += self.weights[position] * weight
+        return scores
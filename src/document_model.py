@@ -0,0 +1,155 @@
+"""
+Shared document model for running Round 1A and Round 1B on the same PDFs
+
+parse_document opens and parses a PDF exactly once with PyMuPDF's
+get_text("dict") and keeps both views the rounds need:
+
+- spans: the columnar SpanStore consumed by the Round 1A outline extractor
+- page_texts: plain text per page for Round 1B, rebuilt from the same span
+  data line by line (the way get_text() lays it out) instead of re-extracted
+- toc / metadata_title: the embedded outline, so bookmarked PDFs take the
+  same fast path as process_pdf_to_outline
+"""
+
+import os
+
+try:
+    from .extraction_cache import get_extraction_cache
+    from .metrics import timer, record_document
+    from .pdf_source import PDFSource
+    from .span_store import SpanStore
+    from .process_pdfs import (
+        iter_text_dict_spans, outline_from_pages, outline_from_bookmarks, metadata_title,
+        select_title, first_page_spans, SPAN_EXTRACTOR_VERSION
+    )
+except ImportError:
+    from extraction_cache import get_extraction_cache
+    from metrics import timer, record_document
+    from pdf_source import PDFSource
+    from span_store import SpanStore
+    from process_pdfs import (
+        iter_text_dict_spans, outline_from_pages, outline_from_bookmarks, metadata_title,
+        select_title, first_page_spans, SPAN_EXTRACTOR_VERSION
+    )
+
+# Bump when the cached document layout changes (it also embeds the span extractor version)
+DOCUMENT_CACHE_VERSION = f"{SPAN_EXTRACTOR_VERSION}.2"
+
+class ParsedDocument:
+    """One PDF parsed once: span data for Round 1A and page text for Round 1B"""
+
+    def __init__(self, path, spans, page_texts, toc=None, metadata_title=""):
+        self.path = str(path)
+        self.name = os.path.basename(self.path)
+        self.spans = spans
+        self.page_texts = page_texts
+        self.toc = toc or []
+        self.metadata_title = metadata_title
+
+    def outline(self, use_bookmarks=True):
+        """Round 1A outline: the embedded bookmarks if usable, else the font heuristics"""
+        if use_bookmarks:
+            bookmarks = outline_from_bookmarks(self.toc, len(self.spans))
+            if bookmarks is not None:
+                return {
+                    "title": self.metadata_title or select_title(first_page_spans(self.spans)),
+                    "outline": bookmarks
+                }
+        with timer("headings", self.path):
+            return outline_from_pages(self.spans)
+
+    def pages_text(self):
+        """Page list in the format of persona_intelligence.extract_text_from_pdf"""
+        return [
+            {
+                "page_number": page_num + 1,  # 1-based for user reference
+                "text": text,
+                "file": self.name
+            }
+            for page_num, text in enumerate(self.page_texts)
+        ]
+
+def page_text_from_text_dict(text_dict):
+    """Plain page text laid out like page.get_text(): span text per line, one line per row"""
+    lines = []
+    for block in text_dict["blocks"]:
+        if "lines" in block:
+            for line in block["lines"]:
+                lines.append("".join(span["text"] for span in line["spans"]))
+                lines.append("\n")
+    return "".join(lines).strip()
+
+def parse_document(filepath):
+    """
+    Parse a PDF once and return a ParsedDocument
+    The file is mapped once (see pdf_source) for the cache digest, PyMuPDF and,
+    when PyMuPDF fails, the PyPDF2 fallback (one read for both views)
+    """
+    try:
+        source = PDFSource(filepath)
+    except OSError as e:
+        print(f"Error parsing PDF {filepath}: {e}")
+        return ParsedDocument(filepath, SpanStore(), [])
+
+    with source:
+        cache = get_extraction_cache()
+        cache_key = None
+        if cache is not None:
+            try:
+                cache_key = cache.key_for(filepath, "document", DOCUMENT_CACHE_VERSION, digest=source.digest())
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    spans = SpanStore.from_dict(cached["spans"])
+                    record_document(filepath, len(spans), spans.span_count)
+                    return ParsedDocument(filepath, spans, cached["page_texts"], cached["toc"],
+                                          cached["metadata_title"])
+            except OSError as e:
+                print(f"Cache lookup failed for {filepath}: {e}")
+
+        spans = SpanStore()
+        page_texts = []
+        try:
+            doc = source.open_fitz()
+            try:
+                with timer("extract", filepath):
+                    for page_num in range(len(doc)):
+                        text_dict = doc.load_page(page_num).get_text("dict")
+
+                        for span in iter_text_dict_spans(text_dict):
+                            spans.add_span(*span)
+                        spans.end_page(page_num)
+
+                        page_texts.append(page_text_from_text_dict(text_dict))
+
+                toc = doc.get_toc(simple=True)
+                title = metadata_title(doc.metadata)
+            finally:
+                doc.close()
+
+            document = ParsedDocument(filepath, spans, page_texts, toc, title)
+            record_document(filepath, len(spans), spans.span_count)
+            if cache_key is not None:
+                cache.put(cache_key, {"spans": spans.to_dict(), "page_texts": page_texts,
+                                      "toc": toc, "metadata_title": title})
+
+            return document
+
+        except Exception as e:
+            print(f"Error parsing PDF {filepath}: {e}")
+            # Fallback to PyPDF2 for basic text extraction, from the same buffer
+            try:
+                spans = SpanStore()
+                page_texts = []
+                pdf_reader = source.pypdf2_reader()
+                for page_num, page in enumerate(pdf_reader.pages):
+                    text = page.extract_text()
+                    # Create basic spans without font info
+                    for line in text.split('\n'):
+                        if line.strip():
+                            spans.add_span(line.strip(), "unknown", 12, 0, (0, 0, 0, 0))
+                    spans.end_page(page_num)
+                    page_texts.append(text.strip())
+                return ParsedDocument(filepath, spans, page_texts)
+            except Exception as e2:
+                print(f"Fallback extraction also failed: {e2}")
+                return ParsedDocument(filepath, SpanStore(), [])
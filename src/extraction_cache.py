@@ -0,0 +1,160 @@
+"""
+Content-addressed on-disk cache for PDF extraction results
+
+Entries are keyed by the SHA-256 of the PDF bytes, the kind of extraction
+("spans" for Round 1A, "text" for Round 1B), the extractor version and the
+PyMuPDF version, so a renamed or copied file still hits and any change to the
+file or the extraction code misses. The cache directory is bounded in size
+and evicts least-recently-used entries first.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+from pathlib import Path
+
+try:
+    from .metrics import configure_metrics, get_metrics, record
+except ImportError:
+    from metrics import configure_metrics, get_metrics, record
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1 GB
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def pymupdf_version():
+    """Installed PyMuPDF version ("none" without it); imported on first use to keep startup light"""
+    try:
+        import fitz
+    except ImportError:
+        return "none"
+    return fitz.VersionBind
+
+def file_digest(filepath):
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ExtractionCache:
+    """Size-bounded LRU cache of extraction results stored as JSON files"""
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._total_bytes = sum(size for _, size, _ in self._entries())
+
+    def key_for(self, filepath, kind, version, digest=None):
+        """Cache key for one extraction of one file (digest: its file_digest, if already known)"""
+        return f"{digest or file_digest(filepath)}-{kind}-v{version}-{pymupdf_version()}"
+
+    def get(self, key):
+        """Return the cached value for key, or None"""
+        entry = self.cache_dir / f"{key}.json"
+        try:
+            with open(entry, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+            os.utime(entry)  # mark as recently used
+        except (OSError, ValueError):
+            self.misses += 1
+            self._record_lookup(key, False)
+            return None
+
+        self.hits += 1
+        self._record_lookup(key, True)
+        return value
+
+    def _record_lookup(self, key, hit):
+        """Metrics event for one lookup, labelled with the extraction kind of a key_for key"""
+        if get_metrics() is not None:
+            parts = key.split("-")
+            record("cache", kind=parts[1] if len(parts) > 2 else "other", hit=hit)
+
+    def put(self, key, value):
+        """Store value under key (atomically) and evict old entries if needed"""
+        entry = self.cache_dir / f"{key}.json"
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(value, f, separators=(',', ':'), ensure_ascii=False)
+            try:
+                replaced_bytes = entry.stat().st_size  # overwriting a key frees its old entry
+            except OSError:
+                replaced_bytes = 0
+            os.replace(tmp_path, entry)
+            self._total_bytes += entry.stat().st_size - replaced_bytes
+        except OSError as e:
+            print(f"Could not write cache entry {entry.name}: {e}")
+            return
+
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _entries(self):
+        """(path, size, last used) for every cache entry"""
+        entries = []
+        for entry in self.cache_dir.glob("*.json"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue  # removed by another process
+            entries.append((entry, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self):
+        """Drop least-recently-used entries until the cache is at 90% of its limit"""
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+
+        for entry, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+            total -= size
+
+        self._total_bytes = total
+
+_cache = None
+
+def configure_extraction_cache(cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+    """Enable the process-wide extraction cache (None disables it)"""
+    global _cache
+    _cache = ExtractionCache(cache_dir, max_bytes) if cache_dir else None
+    return _cache
+
+def get_extraction_cache():
+    """The process-wide extraction cache, or None when caching is disabled"""
+    return _cache
+
+def pool_worker_args():
+    """initargs for configure_pool_worker: this process's cache and metrics settings"""
+    cache_args = (_cache.cache_dir, _cache.max_bytes) if _cache is not None else (None,)
+    metrics = get_metrics()
+    return cache_args, metrics.path if metrics is not None else None
+
+def configure_pool_worker(cache_args, metrics_path):
+    """Process pool initializer: use the parent's extraction cache and metrics file, if any"""
+    configure_extraction_cache(*cache_args)
+    configure_metrics(metrics_path, truncate=False)
+
+def run_in_worker_process(fn, *args):
+    """
+    fn(*args) in a fresh single-use pool worker (configured like configure_pool_worker)
+    When a worker dies, ProcessPoolExecutor fails every pending task with
+    BrokenProcessPool; rerunning those tasks one per process keeps the crash
+    to the task that caused it.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=1, initializer=configure_pool_worker,
+                             initargs=pool_worker_args()) as executor:
+        return executor.submit(fn, *args).result()
@@ -0,0 +1,257 @@
+"""
+Incremental (watch) mode: only reprocess PDFs that were added or changed
+
+A manifest stored next to the outputs records, per input PDF, its size,
+mtime and content hash together with what was produced for it. Each sync
+compares the input directory against the manifest:
+
+- Round 1A: outlines are written for new/changed PDFs and deleted for
+  removed ones; unchanged PDFs are not touched. The outline options
+  (title only, bookmarks, streaming, budget, JSON layout) are stored in the
+  manifest; starting with different ones reprocesses every PDF.
+- Round 1B: new/changed PDFs are summarised once (per-page persona scores,
+  see persona_intelligence.summarize_document); the collection ranking is
+  then rebuilt from the cached summaries without re-extracting anything.
+  The ranking options (top_k, ranking, segmentation, dedupe) are stored in
+  the manifest too, so a restart with different ones rebuilds the output.
+"""
+
+import os
+import json
+import time
+import tempfile
+from pathlib import Path
+
+try:
+    from .extraction_cache import file_digest
+    from .output_writer import write_json_atomic
+    from .process_pdfs import process_pdf_to_outline, process_pdf_to_title
+    from .resource_guard import process_pdf_guarded
+    from .persona_intelligence import (
+        extract_text_from_pdf, summarize_document, analyze_document_summaries,
+        build_persona_output, save_persona_output, display_persona_name
+    )
+except ImportError:
+    from extraction_cache import file_digest
+    from output_writer import write_json_atomic
+    from process_pdfs import process_pdf_to_outline, process_pdf_to_title
+    from resource_guard import process_pdf_guarded
+    from persona_intelligence import (
+        extract_text_from_pdf, summarize_document, analyze_document_summaries,
+        build_persona_output, save_persona_output, display_persona_name
+    )
+
+MANIFEST_NAME = ".watch_manifest"  # not *.json, so it never looks like an output
+MANIFEST_VERSION = 1
+
+# Round 1B watch mode always ranks whole pages by keyword; main.py rejects
+# --ranking bm25, --segmentation heading and --dedupe-pages with --watch
+ROUND1B_WATCH_RANKING = {"ranking": "keyword", "segmentation": "page", "dedupe_pages": False}
+
+# Files modified more recently than this may still be being copied in
+SETTLE_SECONDS = 1.0
+
+class WatchManifest:
+    """
+    (path, size, mtime, hash) -> output records, persisted as JSON
+    settings: the options the outputs were produced with; entries recorded
+    under other settings are dropped, so every PDF is processed again
+    """
+
+    def __init__(self, path, round_type, settings=None):
+        self.path = Path(path)
+        self.round_type = round_type
+        self.settings = json.loads(json.dumps(settings or {}))  # as it reads back from the file
+        self.entries = {}
+        self.dirty = False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if (data.get("version") == MANIFEST_VERSION and data.get("round") == round_type
+                    and data.get("settings", {}) == self.settings):
+                self.entries = data["entries"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def save(self):
+        """Write the manifest atomically"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({
+                "version": MANIFEST_VERSION,
+                "round": self.round_type,
+                "settings": self.settings,
+                "entries": self.entries
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+def scan_input(input_path, manifest, settle_seconds=SETTLE_SECONDS):
+    """
+    Compare the PDFs in input_path with the manifest
+    Returns: (changed, removed, current) - changed is a list of (path, stat, sha256)
+    for new or modified PDFs, removed the names of PDFs that disappeared, current
+    every PDF present (in directory order, as the batch mode sees them)
+    """
+    now = time.time()
+    changed = []
+    current = []
+
+    for pdf_file in input_path.glob("*.pdf"):
+        try:
+            stat = pdf_file.stat()
+        except OSError:
+            continue  # removed while scanning
+
+        entry = manifest.entries.get(pdf_file.name)
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            current.append(pdf_file)
+            continue
+
+        if now - stat.st_mtime < settle_seconds:
+            # Still being written; a previous version (if any) stays in effect
+            if entry:
+                current.append(pdf_file)
+            continue
+
+        digest = file_digest(pdf_file)
+        if entry and entry["sha256"] == digest:
+            # Touched but identical content
+            entry["size"], entry["mtime"] = stat.st_size, stat.st_mtime
+            manifest.dirty = True
+        else:
+            changed.append((pdf_file, stat, digest))
+        current.append(pdf_file)
+
+    present = {pdf_file.name for pdf_file in current}
+    removed = [name for name in manifest.entries if name not in present]
+
+    if changed or removed:
+        manifest.dirty = True
+
+    return changed, removed, current
+
+def outline_for(pdf_file, title_only=False, use_bookmarks=True, streaming=False, page_workers=1, budget=None):
+    """Round 1A result for one PDF with main.py's outline options (see run_round1a_serial)"""
+    if title_only:
+        return process_pdf_to_title(str(pdf_file))
+    if budget is not None:
+        return process_pdf_guarded(str(pdf_file), budget, use_bookmarks)
+    return process_pdf_to_outline(str(pdf_file), streaming=streaming, page_workers=page_workers,
+                                  use_bookmarks=use_bookmarks)
+
+def sync_round1a(input_path, output_path, manifest, options=None):
+    """
+    Bring Round 1A outputs in line with the input directory; returns number of changes
+    options: keyword arguments of outline_for, plus compact_json and fast_json
+    """
+    options = dict(options or {})
+    compact_json = options.pop("compact_json", False)
+    fast_json = options.pop("fast_json", False)
+    changed, removed, _ = scan_input(input_path, manifest)
+
+    for pdf_file, stat, digest in changed:
+        print(f"Processing: {pdf_file.name}")
+        output_file = output_path / f"{pdf_file.stem}.json"
+        try:
+            write_json_atomic(output_file, outline_for(pdf_file, **options), compact_json, fast_json)
+            print(f"✅ Saved: {output_file.name}")
+        except Exception as e:
+            print(f"❌ Error processing {pdf_file.name}: {e}")
+            continue
+
+        manifest.entries[pdf_file.name] = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "sha256": digest,
+            "output": output_file.name
+        }
+
+    for name in removed:
+        entry = manifest.entries.pop(name)
+        try:
+            (output_path / entry["output"]).unlink()
+            print(f"🗑️  Removed: {entry['output']}")
+        except OSError:
+            pass
+
+    return len(changed) + len(removed)
+
+def sync_round1b(input_path, output_path, manifest, top_k=None):
+    """Bring the Round 1B output in line with the input directory; returns number of changes"""
+    changed, removed, current = scan_input(input_path, manifest)
+
+    for pdf_file, stat, digest in changed:
+        print(f"  📄 Processing: {pdf_file.name}")
+        manifest.entries[pdf_file.name] = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "sha256": digest,
+            "summary": summarize_document(extract_text_from_pdf(pdf_file))
+        }
+
+    for name in removed:
+        manifest.entries.pop(name)
+        print(f"🗑️  Dropped: {name}")
+
+    output_file = output_path / "persona_intelligence_output.json"
+    if not (changed or removed or not output_file.exists()):
+        return 0
+
+    document_names = [pdf_file.name for pdf_file in current if pdf_file.name in manifest.entries]
+    if not document_names:
+        if output_file.exists():
+            output_file.unlink()
+        return len(changed) + len(removed)
+
+    summaries = [manifest.entries[name]["summary"] for name in document_names]
+    persona_name, persona_scores, extracted_sections, subsection_analysis = analyze_document_summaries(
+        document_names, summaries, top_k
+    )
+    output_data = build_persona_output(document_names, persona_name, persona_scores,
+                                       extracted_sections, subsection_analysis)
+    save_persona_output(output_path, output_data)
+    print(f"🎯 {display_persona_name(persona_name)}: {len(extracted_sections)} relevant sections "
+          f"across {len(document_names)} documents")
+
+    return len(changed) + len(removed) + 1
+
+def watch_directory(input_dir, output_dir, round_type, interval=2.0, max_cycles=None, top_k=None,
+                    round1a_options=None):
+    """
+    Poll input_dir every `interval` seconds and keep output_dir up to date
+    Runs until interrupted (or for max_cycles syncs, used by tests)
+    top_k: Round 1B only, limit on the number of ranked sections
+    round1a_options: Round 1A only, outline options (see sync_round1a)
+    """
+    input_path = Path(input_dir)
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    if round_type == "round1a":
+        settings = round1a_options
+    else:
+        settings = dict(ROUND1B_WATCH_RANKING, top_k=top_k)
+    manifest = WatchManifest(output_path / MANIFEST_NAME, round_type, settings)
+
+    print(f"👀 Watching {input_path} ({round_type.upper()}), polling every {interval:g}s")
+
+    cycles = 0
+    try:
+        while True:
+            if round_type == "round1a":
+                sync_round1a(input_path, output_path, manifest, round1a_options)
+            else:
+                sync_round1b(input_path, output_path, manifest, top_k)
+            if manifest.dirty:
+                manifest.save()
+            cycles += 1
+            if max_cycles is not None and cycles >= max_cycles:
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        if manifest.dirty:
+            manifest.save()
+        print("\n👋 Watch mode stopped")
+
+    return True
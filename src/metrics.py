@@ -0,0 +1,178 @@
+"""
+Structured metrics for the extraction pipeline
+
+When enabled with configure_metrics(path), every instrumented step appends
+one JSON object per line to the metrics file:
+
+    {"ts": ..., "pid": ..., "event": "timer", "stage": "open", "document": "a.pdf", "seconds": 0.0123}
+    {"ts": ..., "pid": ..., "event": "document", "document": "a.pdf", "pages": 12, "spans": 840}
+    {"ts": ..., "pid": ..., "event": "cache", "kind": "spans", "hit": true}
+    {"ts": ..., "pid": ..., "event": "timer", "stage": "write", "document": null, "path": "a.json", "seconds": 0.002}
+
+Stages are open, bookmarks, extract, headings, persona_detection, index,
+scoring and write. Each line is a single O_APPEND write, so worker processes
+(which inherit or reopen the file) can share it. summarize_metrics aggregates
+the file afterwards (per-stage totals, slowest documents, cache hit rate) and
+write_prometheus renders that summary in the Prometheus text format.
+
+When metrics are disabled, timer() returns a shared no-op context manager and
+record() returns immediately, so instrumented code pays one global lookup.
+"""
+
+import os
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+NULL_TIMER = nullcontext()
+
+class MetricsRecorder:
+    """Appends metric events as JSON lines to one file"""
+
+    def __init__(self, path, truncate=True):
+        self.path = str(path)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND | (os.O_TRUNC if truncate else 0)
+        self._fd = os.open(self.path, flags, 0o644)
+
+    def emit(self, event, **fields):
+        """Append one event line"""
+        line = json.dumps({"ts": round(time.time(), 6), "pid": os.getpid(), "event": event, **fields},
+                          ensure_ascii=False)
+        os.write(self._fd, (line + "\n").encode('utf-8'))
+
+    @contextmanager
+    def timer(self, stage, document=None, **fields):
+        """Time the enclosed block as one "timer" event (also when it raises)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.emit("timer", stage=stage, document=document, **fields,
+                      seconds=round(time.perf_counter() - start, 6))
+
+    def close(self):
+        os.close(self._fd)
+
+_metrics = None
+
+def configure_metrics(path, truncate=True):
+    """
+    Enable process-wide metrics written to path (None disables them)
+    Worker processes pass truncate=False to append to the parent's file
+    """
+    global _metrics
+    if _metrics is not None:
+        _metrics.close()
+    _metrics = MetricsRecorder(path, truncate) if path else None
+    return _metrics
+
+def get_metrics():
+    """The process-wide MetricsRecorder, or None when metrics are disabled"""
+    return _metrics
+
+def timer(stage, document=None, **fields):
+    """
+    Context manager timing one pipeline stage (a no-op when metrics are disabled)
+    document is the input PDF the time is attributed to; fields are added to the event
+    """
+    if _metrics is None:
+        return NULL_TIMER
+    return _metrics.timer(stage, str(document) if document is not None else None, **fields)
+
+def record(event, **fields):
+    """Record one event (a no-op when metrics are disabled)"""
+    if _metrics is not None:
+        _metrics.emit(event, **fields)
+
+def record_document(document, pages, spans=None):
+    """Record the page (and span) count of an extracted document"""
+    if _metrics is not None:
+        fields = {"document": str(document), "pages": pages}
+        if spans is not None:
+            fields["spans"] = spans
+        _metrics.emit("document", **fields)
+
+def summarize_metrics(path, slowest=5):
+    """
+    Aggregate a metrics file
+    Returns: {"stages": {stage: {"count", "seconds", "max_seconds"}},
+    "documents", "pages", "spans", "cache": {kind: {"hits", "misses"}},
+    "slowest": [(document, seconds)] summed over all stages}
+    """
+    stages = defaultdict(lambda: {"count": 0, "seconds": 0.0, "max_seconds": 0.0})
+    document_seconds = defaultdict(float)
+    documents = set()
+    pages = spans = 0
+    cache = defaultdict(lambda: {"hits": 0, "misses": 0})
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue  # line cut off by a killed process
+
+            kind = event.get("event")
+            if kind == "timer":
+                stage = stages[event["stage"]]
+                stage["count"] += 1
+                stage["seconds"] += event["seconds"]
+                stage["max_seconds"] = max(stage["max_seconds"], event["seconds"])
+                if event.get("document"):
+                    document_seconds[event["document"]] += event["seconds"]
+            elif kind == "document":
+                documents.add(event["document"])
+                pages += event["pages"]
+                spans += event.get("spans", 0)
+            elif kind == "cache":
+                cache[event["kind"]]["hits" if event["hit"] else "misses"] += 1
+
+    return {
+        "stages": dict(stages),
+        "documents": len(documents),
+        "pages": pages,
+        "spans": spans,
+        "cache": dict(cache),
+        "slowest": sorted(document_seconds.items(), key=lambda item: -item[1])[:slowest]
+    }
+
+def prometheus_text(summary):
+    """Render a summarize_metrics result in the Prometheus text exposition format"""
+    lines = [
+        "# HELP pdf_pipeline_stage_seconds Time spent per pipeline stage",
+        "# TYPE pdf_pipeline_stage_seconds summary"
+    ]
+    for stage, values in sorted(summary["stages"].items()):
+        lines.append(f'pdf_pipeline_stage_seconds_sum{{stage="{stage}"}} {values["seconds"]:.6f}')
+        lines.append(f'pdf_pipeline_stage_seconds_count{{stage="{stage}"}} {values["count"]}')
+
+    lines += [
+        "# HELP pdf_pipeline_stage_max_seconds Slowest single run of each pipeline stage",
+        "# TYPE pdf_pipeline_stage_max_seconds gauge"
+    ]
+    for stage, values in sorted(summary["stages"].items()):
+        lines.append(f'pdf_pipeline_stage_max_seconds{{stage="{stage}"}} {values["max_seconds"]:.6f}')
+
+    for name, help_text in (("documents", "Documents extracted"), ("pages", "Pages extracted"),
+                            ("spans", "Text spans extracted")):
+        lines += [
+            f"# HELP pdf_pipeline_{name}_total {help_text}",
+            f"# TYPE pdf_pipeline_{name}_total counter",
+            f"pdf_pipeline_{name}_total {summary[name]}"
+        ]
+
+    lines += [
+        "# HELP pdf_pipeline_cache_lookups_total Extraction cache lookups",
+        "# TYPE pdf_pipeline_cache_lookups_total counter"
+    ]
+    for kind, counts in sorted(summary["cache"].items()):
+        lines.append(f'pdf_pipeline_cache_lookups_total{{kind="{kind}",result="hit"}} {counts["hits"]}')
+        lines.append(f'pdf_pipeline_cache_lookups_total{{kind="{kind}",result="miss"}} {counts["misses"]}')
+
+    return "\n".join(lines) + "\n"
+
+def write_prometheus(metrics_path, output_path):
+    """Summarize a metrics file into a Prometheus text dump at output_path"""
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(prometheus_text(summarize_metrics(metrics_path)))
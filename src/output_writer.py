@@ -0,0 +1,125 @@
+"""
+Background writer for JSON outputs
+
+Extraction is CPU-bound while writing results can stall on slow (e.g.
+network-mounted) output volumes. OutputWriter moves serialisation and file
+I/O to a writer thread fed by a bounded queue, so the processing loop only
+waits when storage falls more than a queue's worth of documents behind.
+
+Every file is written to a temporary file in the target directory, flushed
+to disk and renamed over the destination, so a crash never leaves a partial
+JSON file behind.
+"""
+
+import os
+import json
+import queue
+import tempfile
+import threading
+
+try:
+    import orjson  # optional: faster JSON encoding
+except ImportError:
+    orjson = None
+
+try:
+    from .metrics import timer
+except ImportError:
+    from metrics import timer
+
+DEFAULT_QUEUE_SIZE = 64
+
+def current_umask():
+    """The process umask (os.umask can only be read by setting it)"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+# Read once at import: setting the umask to read it would race with files created by other threads
+OUTPUT_FILE_MODE = 0o666 & ~current_umask()
+
+def encode_json(data, compact=False, fast=False):
+    """
+    Serialise data to UTF-8 bytes
+    Default layout is the repo's usual indent=2; compact drops all whitespace.
+    fast=True uses orjson when it is installed (stdlib json otherwise).
+    """
+    if fast and orjson is not None:
+        return orjson.dumps(data, option=0 if compact else orjson.OPT_INDENT_2)
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+def write_atomic(path, payload):
+    """Write bytes to path via a temporary file in the same directory and os.replace"""
+    with timer("write", path=str(path)):
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+        try:
+            os.fchmod(fd, OUTPUT_FILE_MODE)  # mkstemp creates 0600; give outputs the mode open() would
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+def write_json_atomic(path, data, compact=False, fast=False):
+    """Serialise data (see encode_json) and write it atomically"""
+    write_atomic(path, encode_json(data, compact, fast))
+
+class OutputWriter:
+    """
+    Writes JSON outputs on a background thread fed by a bounded queue
+
+    submit() returns as soon as the document is queued; it only blocks when
+    max_pending writes are already waiting, which bounds memory if storage
+    cannot keep up. Write errors do not stop the writer: they are reported
+    as they happen and returned by close().
+    """
+
+    def __init__(self, max_pending=DEFAULT_QUEUE_SIZE, compact=False, fast=False):
+        self.compact = compact
+        self.fast = fast
+        self.written = 0
+        self.errors = []  # (path, exception) per failed write
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, name="output-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, path, data):
+        """Queue data to be written as JSON to path"""
+        self._queue.put((path, data))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            path, data = item
+            try:
+                write_json_atomic(path, data, self.compact, self.fast)
+                self.written += 1
+                print(f"✅ Saved: {os.path.basename(path)}")
+            except Exception as e:
+                self.errors.append((path, e))
+                print(f"❌ Error writing {os.path.basename(path)}: {e}")
+
+    def close(self):
+        """Wait for all queued writes to finish; returns the list of failed writes"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        return self.errors
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,175 @@
+"""
+Inverted index over the page text of a Round 1B collection
+
+Built once from extract_text_from_pdf output, the index answers relevance
+queries without rescanning page text:
+
+- token postings: word token -> [[page id, term frequency], ...] for ad hoc queries
+- keyword postings: persona keyword -> [[page id, whole-word match count], ...]
+- priority postings: priority section -> [page id, ...] (substring presence)
+- per-page and per-document length statistics
+
+Keyword and priority postings are produced by the same PersonaMatcher scan
+that score_section_relevance uses, so scores looked up from the index are
+identical to scoring the text directly.
+"""
+
+import os
+import re
+import json
+import hashlib
+import tempfile
+from collections import Counter
+
+INDEX_VERSION = 1
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+def collection_fingerprint(documents_text):
+    """Hash of file names and page texts; an index is only valid for the same fingerprint"""
+    digest = hashlib.sha256()
+    for doc_pages in documents_text:
+        for page in doc_pages:
+            digest.update(page["file"].encode('utf-8'))
+            digest.update(b"\0")
+            digest.update(page["text"].encode('utf-8'))
+            digest.update(b"\0")
+    return digest.hexdigest()
+
+class PageIndex:
+    """Inverted index over the non-empty pages of a document collection"""
+
+    def __init__(self):
+        self.fingerprint = None
+        self.documents = []        # file names, indexed by document id
+        self.pages = []            # {"doc", "page_number", "length"} per page id
+        self.token_postings = {}
+        self.keyword_postings = {}
+        self.priority_postings = {}
+
+    @classmethod
+    def build(cls, documents_text, matcher):
+        """Index every non-empty page; matcher is a persona_intelligence.PersonaMatcher"""
+        index = cls()
+        index.fingerprint = collection_fingerprint(documents_text)
+        token_postings = {}
+        keyword_postings = {}
+        priority_postings = {}
+
+        for doc_pages in documents_text:
+            if not doc_pages:
+                continue
+            doc_id = len(index.documents)
+            index.documents.append(doc_pages[0]["file"])
+
+            for page in doc_pages:
+                if not page["text"].strip():
+                    continue
+
+                page_id = len(index.pages)
+                text_lower = page["text"].lower()
+                index.pages.append({
+                    "doc": doc_id,
+                    "page_number": page["page_number"],
+                    "length": len(text_lower.split())
+                })
+
+                for token, count in Counter(TOKEN_PATTERN.findall(text_lower)).items():
+                    token_postings.setdefault(token, []).append([page_id, count])
+
+                keyword_counts, priority_hits = matcher.scan(text_lower)
+                for keyword, count in keyword_counts.items():
+                    keyword_postings.setdefault(keyword, []).append([page_id, count])
+                for priority in priority_hits:
+                    priority_postings.setdefault(priority, []).append(page_id)
+
+        index.token_postings = token_postings
+        index.keyword_postings = keyword_postings
+        index.priority_postings = priority_postings
+        return index
+
+    @property
+    def average_page_length(self):
+        if not self.pages:
+            return 0.0
+        return sum(page["length"] for page in self.pages) / len(self.pages)
+
+    def document_lengths(self):
+        """Total word count per document name"""
+        lengths = Counter()
+        for page in self.pages:
+            lengths[self.documents[page["doc"]]] += page["length"]
+        return dict(lengths)
+
+    def page_ref(self, page_id):
+        """(file name, 1-based page number) of a page id"""
+        page = self.pages[page_id]
+        return self.documents[page["doc"]], page["page_number"]
+
+    def term_frequencies(self, term):
+        """{page id: frequency} of a single word token"""
+        return dict(self.token_postings.get(term.lower(), []))
+
+    def score_persona(self, persona_data):
+        """
+        score_section_relevance for every indexed page, by postings lookup
+        Returns: list of (score, matched_keywords) indexed by page id
+        """
+        scores = [0] * len(self.pages)
+        matched = [[] for _ in self.pages]
+
+        # Score based on keyword matches
+        for keyword in persona_data["keywords"]:
+            for page_id, count in self.keyword_postings.get(keyword.lower(), []):
+                scores[page_id] += count * 2  # Base score per match
+                matched[page_id].append(keyword)
+
+        # Bonus for priority sections
+        for priority in persona_data["priority_sections"]:
+            for page_id in self.priority_postings.get(priority.lower(), []):
+                scores[page_id] += 10  # High bonus for priority sections
+                if priority not in matched[page_id]:
+                    matched[page_id].append(priority)
+
+        # Bonus for longer, more substantial content
+        for page_id, page in enumerate(self.pages):
+            if page["length"] > 50:
+                scores[page_id] += min(page["length"] / 10, 20)  # Cap at 20 bonus points
+
+        return list(zip(scores, matched))
+
+    def save(self, path):
+        """Persist the index as JSON (atomic replace)"""
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "fingerprint": self.fingerprint,
+                "documents": self.documents,
+                "pages": self.pages,
+                "token_postings": self.token_postings,
+                "keyword_postings": self.keyword_postings,
+                "priority_postings": self.priority_postings
+            }, f, separators=(',', ':'), ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Load a saved index, or None if missing or from another index version"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != INDEX_VERSION:
+            return None
+
+        index = cls()
+        index.fingerprint = data["fingerprint"]
+        index.documents = data["documents"]
+        index.pages = data["pages"]
+        index.token_postings = data["token_postings"]
+        index.keyword_postings = data["keyword_postings"]
+        index.priority_postings = data["priority_postings"]
+        return index
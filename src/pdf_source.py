@@ -0,0 +1,117 @@
+"""
+Single-read access to a PDF's bytes for every parser that needs them
+
+PDFSource memory-maps the file once. The same buffer is then used to
+- open the document in PyMuPDF (stream opening instead of by path)
+- run the PyPDF2 fallback when PyMuPDF fails
+- compute the extraction cache digest
+so the file is read from storage once however many of these touch it.
+
+For page-range worker processes, PDFSource.share() copies the bytes into a
+named shared memory block once; workers attach to it with open_source(handle)
+instead of reopening (and re-reading) the file.
+"""
+
+import io
+import mmap
+import hashlib
+from collections import namedtuple
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import fitz  # PyMuPDF
+
+try:
+    from .metrics import timer
+except ImportError:
+    from metrics import timer
+
+# PyMuPDF before 1.26 rejects a memoryview stream ("bad type: 'stream'"); those
+# versions get a bytes copy of the buffer instead
+FITZ_STREAM_TAKES_MEMORYVIEW = tuple(int(part) for part in fitz.VersionBind.split(".")[:2]) >= (1, 26)
+
+# Picklable reference to a PDF in shared memory, see PDFSource.share
+SharedPDF = namedtuple("SharedPDF", ["name", "size", "path"])
+
+class PDFSource:
+    """A PDF's bytes, mapped once; use as a context manager or call close()"""
+
+    def __init__(self, filepath):
+        self.path = str(filepath)
+        self._file = open(self.path, 'rb')
+        self._mmap = None
+        self._shm = None
+        self._digest = None
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.view = memoryview(self._mmap)
+        except ValueError:
+            self.view = memoryview(b"")  # empty file: nothing to map
+
+    @classmethod
+    def attach(cls, shared):
+        """PDFSource over a SharedPDF block created by another process"""
+        source = cls.__new__(cls)
+        source.path = shared.path
+        source._file = None
+        source._mmap = None
+        source._shm = shared_memory.SharedMemory(name=shared.name)
+        source._digest = None
+        source.view = source._shm.buf[:shared.size]
+        return source
+
+    def __len__(self):
+        return len(self.view)
+
+    def open_fitz(self):
+        """PyMuPDF document over the buffer; close it before closing the source"""
+        with timer("open", self.path):
+            stream = self.view if FITZ_STREAM_TAKES_MEMORYVIEW else bytes(self.view)
+            return fitz.open(stream=stream, filetype="pdf")
+
+    def pypdf2_reader(self):
+        """PyPDF2 reader over the same bytes (the mapping itself when there is one)"""
+        import PyPDF2  # only needed on the fallback path, so imported on first use
+
+        if self._mmap is not None:
+            self._mmap.seek(0)
+            return PyPDF2.PdfReader(self._mmap)
+        return PyPDF2.PdfReader(io.BytesIO(self.view))
+
+    def digest(self):
+        """SHA-256 of the content, same as extraction_cache.file_digest (computed once)"""
+        if self._digest is None:
+            self._digest = hashlib.sha256(self.view).hexdigest()
+        return self._digest
+
+    @contextmanager
+    def share(self):
+        """Copy the bytes into shared memory for worker processes; yields a SharedPDF"""
+        shm = shared_memory.SharedMemory(create=True, size=max(len(self.view), 1))
+        try:
+            shm.buf[:len(self.view)] = self.view
+            yield SharedPDF(shm.name, len(self.view), self.path)
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def close(self):
+        self.view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        if self._file is not None:
+            self._file.close()
+        if self._shm is not None:
+            self._shm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def open_source(source):
+    """PDFSource for a file path or a SharedPDF handle"""
+    if isinstance(source, SharedPDF):
+        return PDFSource.attach(source)
+    return PDFSource(source)
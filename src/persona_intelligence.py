@@ -12,10 +12,29 @@ import json
 import re
 from pathlib import Path
 from datetime import datetime
-import PyPDF2
-import fitz  # PyMuPDF
+import heapq
 from collections import defaultdict, Counter
 
+try:
+    from .extraction_cache import get_extraction_cache
+    from .metrics import timer, record_document
+    from .pdf_source import PDFSource
+    from .page_index import PageIndex, collection_fingerprint
+    from .bm25 import BM25Ranker, persona_query
+    from .sections import extract_sections_from_pdf, split_sections
+    from .dedup import find_duplicate_pages
+except ImportError:
+    from extraction_cache import get_extraction_cache
+    from metrics import timer, record_document
+    from pdf_source import PDFSource
+    from page_index import PageIndex, collection_fingerprint
+    from bm25 import BM25Ranker, persona_query
+    from sections import extract_sections_from_pdf, split_sections
+    from dedup import find_duplicate_pages
+
+# Bump whenever the page text produced by extract_text_from_pdf changes
+TEXT_EXTRACTOR_VERSION = 1
+
 # Persona definitions with keywords and priorities
 PERSONA_DEFINITIONS = {
     "travel_planner": {
@@ -60,32 +79,164 @@ PERSONA_DEFINITIONS = {
     }
 }
 
-def extract_text_from_pdf(pdf_path):
-    """Extract text from PDF with page information"""
-    pages_text = []
+def _build_trie_pattern(phrases):
+    """Build a regex alternation shaped like a prefix trie (longest match first)"""
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = True
+    
+    def build(node):
+        branches = [
+            re.escape(char) + build(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # A phrase ending here is still allowed to extend; greedy "?" keeps it longest-first
+        return "(?:" + body + ")?" if "" in node else body
     
-    try:
-        # Use PyMuPDF for better text extraction
-        doc = fitz.open(pdf_path)
+    return build(trie)
+
+def _is_word_char(char):
+    """Same notion of a word character as the regex \\w class"""
+    return char.isalnum() or char == "_"
+
+def _is_boundary(text, pos):
+    """Equivalent of the regex \\b assertion at text[pos]"""
+    before = pos > 0 and _is_word_char(text[pos - 1])
+    after = pos < len(text) and _is_word_char(text[pos])
+    return before != after
+
+def _can_self_overlap(keyword):
+    """True if two \\b-bounded occurrences of keyword could overlap"""
+    for start in range(1, len(keyword)):
+        if keyword.startswith(keyword[start:]) and _is_word_char(keyword[start - 1]) != _is_word_char(keyword[start]):
+            return True
+    return False
+
+class PersonaMatcher:
+    """
+    Precompiled matcher for all persona keywords and priority sections
+    
+    A single scan over the (lowercased) text yields whole-word counts for every
+    keyword and the substring presence of every priority section, for all
+    personas at once. Results are identical to running
+    re.findall(r'\\b' + keyword + r'\\b') per keyword and `priority in text`
+    per priority section.
+    """
+    
+    def __init__(self, definitions):
+        self.keywords = set()
+        self.priorities = set()
+        for persona_data in definitions.values():
+            self.keywords.update(k.lower() for k in persona_data["keywords"])
+            self.priorities.update(p.lower() for p in persona_data["priority_sections"])
         
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
-            text = page.get_text()
-            
-            pages_text.append({
-                "page_number": page_num + 1,  # 1-based for user reference
-                "text": text.strip(),
-                "file": os.path.basename(pdf_path)
-            })
+        # Keywords whose occurrences could overlap themselves are counted the
+        # non-overlapping way findall does, with a dedicated pattern
+        self.separate = {
+            keyword: re.compile(r'\b' + re.escape(keyword) + r'\b')
+            for keyword in self.keywords if _can_self_overlap(keyword)
+        }
+        
+        phrases = self.keywords | self.priorities
+        self.pattern = re.compile("(?=(" + _build_trie_pattern(phrases) + "))")
+        
+        # Every phrase that matches at a position is a prefix of the longest one
+        self.prefixes = {
+            phrase: [other for other in phrases if phrase.startswith(other)]
+            for phrase in phrases
+        }
+    
+    def scan(self, text_lower):
+        """Return (keyword -> match count, set of priority sections present)"""
+        keyword_counts = Counter()
+        priority_hits = set()
+        
+        for match in self.pattern.finditer(text_lower):
+            start = match.start()
+            for phrase in self.prefixes[match.group(1)]:
+                if phrase in self.priorities:
+                    priority_hits.add(phrase)
+                if (phrase in self.keywords and phrase not in self.separate
+                        and _is_boundary(text_lower, start)
+                        and _is_boundary(text_lower, start + len(phrase))):
+                    keyword_counts[phrase] += 1
         
-        doc.close()
+        for keyword, pattern in self.separate.items():
+            matches = len(pattern.findall(text_lower))
+            if matches:
+                keyword_counts[keyword] = matches
+        
+        return keyword_counts, priority_hits
+
+PERSONA_MATCHER = PersonaMatcher(PERSONA_DEFINITIONS)
+
+def extract_text_from_pdf(pdf_path):
+    """
+    Extract text from PDF with page information
+    The file is mapped once (see pdf_source) for the cache digest, PyMuPDF and the PyPDF2 fallback
+    """
+    try:
+        source = PDFSource(pdf_path)
+    except OSError as e:
+        print(f"Both extraction methods failed for {pdf_path}: {e}")
+        return []
+    
+    with source:
+        cache = get_extraction_cache()
+        cache_key = None
+        if cache is not None:
+            try:
+                cache_key = cache.key_for(pdf_path, "text", TEXT_EXTRACTOR_VERSION, digest=source.digest())
+                cached_texts = cache.get(cache_key)
+                if cached_texts is not None:
+                    record_document(pdf_path, len(cached_texts))
+                    return [
+                        {
+                            "page_number": page_num + 1,
+                            "text": text,
+                            "file": os.path.basename(pdf_path)
+                        }
+                        for page_num, text in enumerate(cached_texts)
+                    ]
+            except OSError as e:
+                print(f"Cache lookup failed for {pdf_path}: {e}")
+        
+        pages_text = []
         
-    except Exception as e:
-        print(f"Error extracting text from {pdf_path}: {e}")
-        # Fallback to PyPDF2
         try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
+            # Use PyMuPDF for better text extraction
+            doc = source.open_fitz()
+            try:
+                with timer("extract", pdf_path):
+                    for page_num in range(len(doc)):
+                        page = doc.load_page(page_num)
+                        text = page.get_text()
+                        
+                        pages_text.append({
+                            "page_number": page_num + 1,  # 1-based for user reference
+                            "text": text.strip(),
+                            "file": os.path.basename(pdf_path)
+                        })
+            finally:
+                doc.close()
+            
+            record_document(pdf_path, len(pages_text))
+            
+            if cache_key is not None:
+                cache.put(cache_key, [page["text"] for page in pages_text])
+            
+        except Exception as e:
+            print(f"Error extracting text from {pdf_path}: {e}")
+            # Fallback to PyPDF2, from the same buffer
+            try:
+                pages_text = []
+                pdf_reader = source.pypdf2_reader()
                 for page_num, page in enumerate(pdf_reader.pages):
                     text = page.extract_text()
                     pages_text.append({
@@ -93,10 +244,10 @@ def extract_text_from_pdf(pdf_path):
                         "text": text.strip(),
                         "file": os.path.basename(pdf_path)
                     })
-        except Exception as e2:
-            print(f"Both extraction methods failed for {pdf_path}: {e2}")
-    
-    return pages_text
+            except Exception as e2:
+                print(f"Both extraction methods failed for {pdf_path}: {e2}")
+        
+        return pages_text
 
 def detect_persona(documents_text):
     """Detect the most likely persona based on document content"""
@@ -106,6 +257,13 @@ def detect_persona(documents_text):
         for page in doc
     ])
     
+    # One scan counts the keywords of every persona
+    keyword_counts, _ = PERSONA_MATCHER.scan(all_text)
+    
+    return detect_persona_from_counts(keyword_counts)
+
+def detect_persona_from_counts(keyword_counts):
+    """Detect the most likely persona from precomputed keyword -> match counts"""
     persona_scores = {}
     
     for persona_name, persona_data in PERSONA_DEFINITIONS.items():
@@ -114,7 +272,7 @@ def detect_persona(documents_text):
         
         for keyword in persona_data["keywords"]:
             # Count keyword occurrences
-            matches = len(re.findall(r'\b' + re.escape(keyword.lower()) + r'\b', all_text))
+            matches = keyword_counts.get(keyword.lower(), 0)
             if matches > 0:
                 keyword_matches += 1
                 score += matches
@@ -144,22 +302,36 @@ def score_section_relevance(page_text, persona_name):
     if persona_name not in PERSONA_DEFINITIONS:
         return 0, []
     
-    persona_data = PERSONA_DEFINITIONS[persona_name]
     text_lower = page_text.lower()
+    keyword_counts, priority_hits = PERSONA_MATCHER.scan(text_lower)
+    
+    return score_persona_matches(PERSONA_DEFINITIONS[persona_name], keyword_counts, priority_hits, text_lower)
+
+def score_section_all_personas(page_text):
+    """score_section_relevance for every persona with a single scan of the text"""
+    text_lower = page_text.lower()
+    keyword_counts, priority_hits = PERSONA_MATCHER.scan(text_lower)
     
+    return {
+        persona_name: score_persona_matches(persona_data, keyword_counts, priority_hits, text_lower)
+        for persona_name, persona_data in PERSONA_DEFINITIONS.items()
+    }
+
+def score_persona_matches(persona_data, keyword_counts, priority_hits, text_lower):
+    """Relevance score and matched keywords of one persona from a PERSONA_MATCHER scan"""
     score = 0
     matched_keywords = []
     
     # Score based on keyword matches
     for keyword in persona_data["keywords"]:
-        matches = len(re.findall(r'\b' + re.escape(keyword.lower()) + r'\b', text_lower))
+        matches = keyword_counts[keyword.lower()]
         if matches > 0:
             score += matches * 2  # Base score per match
             matched_keywords.append(keyword)
     
     # Bonus for priority sections
     for priority in persona_data["priority_sections"]:
-        if priority.lower() in text_lower:
+        if priority.lower() in priority_hits:
             score += 10  # High bonus for priority sections
             if priority not in matched_keywords:
                 matched_keywords.append(priority)
@@ -171,69 +343,262 @@ def score_section_relevance(page_text, persona_name):
     
     return score, matched_keywords
 
-def extract_sections_and_analyze(documents_text, persona_name):
-    """Extract and analyze sections for persona relevance"""
+def section_title_of(page):
+    """Heading of a heading-bounded section (see sections.py), else the page's first meaningful line"""
+    return page.get("section_title") or extract_section_title(page["text"])
+
+def extract_section_title(page_text):
+    """Section title of a page: its first meaningful line"""
+    lines = page_text.split('\n')
+    section_title = "Content Section"
+    
+    for line in lines[:5]:  # Check first 5 lines
+        clean_line = line.strip()
+        if len(clean_line) > 10 and len(clean_line) < 100:
+            # Likely a title or heading
+            section_title = clean_line
+            break
+    
+    return section_title
+
+def refine_section_text(page_text):
+    """Refined text for subsection analysis (first 500 characters)"""
+    refined_text = page_text[:500] + "..." if len(page_text) > 500 else page_text
+    return refined_text.strip()
+
+def rank_sections(all_sections):
+    """Sort sections by relevance and return them with importance ranks"""
     extracted_sections = []
+    
+    # Sort by relevance score and assign importance ranks
+    all_sections.sort(key=lambda x: x["relevance_score"], reverse=True)
+    
+    for i, section in enumerate(all_sections):
+        section["importance_rank"] = i + 1
+        extracted_section = {
+            "document": section["document"],
+            "page_number": section["page_number"],
+            "section_title": section["section_title"],
+            "importance_rank": section["importance_rank"]
+        }
+        if section.get("duplicate_pages"):
+            extracted_section["duplicate_pages"] = section["duplicate_pages"]
+        extracted_sections.append(extracted_section)
+    
+    return extracted_sections
+
+def append_section(all_sections, subsection_analysis, page, relevance_score, keywords, duplicate_pages=None):
+    """
+    Add a relevant page to the section list and the subsection analysis
+    duplicate_pages: optional [{"document", "page_number"}] of the pages collapsed into this one
+    """
+    section = {
+        "document": page["file"],
+        "page_number": page["page_number"],
+        "section_title": section_title_of(page),
+        "relevance_score": relevance_score,
+        "matched_keywords": keywords
+    }
+    if duplicate_pages:
+        section["duplicate_pages"] = duplicate_pages
+    all_sections.append(section)
+    
+    subsection_analysis.append({
+        "document": page["file"],
+        "page_number": page["page_number"],
+        "refined_text": refine_section_text(page["text"]),
+        "relevance_score": relevance_score,
+        "matched_keywords": keywords
+    })
+
+def keep_top_k(heap, top_k, relevance_score, position, item):
+    """
+    Offer a candidate to a bounded min-heap of the top_k best (score, position, item)
+    Ties keep the earlier position, the order rank_sections' stable sort gives them.
+    """
+    entry = (relevance_score, -position, item)
+    if len(heap) < top_k:
+        heapq.heappush(heap, entry)
+    elif entry > heap[0]:
+        heapq.heapreplace(heap, entry)
+
+def top_k_in_page_order(heap):
+    """Items of a keep_top_k heap, in the order they were offered"""
+    return [item for _, _, item in sorted(heap, key=lambda entry: -entry[1])]
+
+def persona_page_scores(index, persona_name, ranking="keyword", ranker=None, job=None):
+    """
+    (score, matched keywords) of every page of a PageIndex for a known persona
+    ranking "bm25" scores with BM25 (ranker: a BM25Ranker of index, built if not given)
+    against the persona's keywords plus the content words of job, the job-to-be-done
+    text; otherwise with the score_section_relevance formula
+    Returns: list indexed by page id
+    """
+    persona_data = PERSONA_DEFINITIONS[persona_name]
+    if ranking == "bm25":
+        bm25_scores = (ranker or BM25Ranker(index)).score(persona_query(persona_data, job))
+        return [
+            (round(bm25_score, 4), keywords)
+            for bm25_score, (_, keywords) in zip(bm25_scores, index.score_persona(persona_data))
+        ]
+    return index.score_persona(persona_data)
+
+def extract_sections_and_analyze(documents_text, persona_name, index=None, ranking="keyword", top_k=None,
+                                 page_scores=None, dedupe=False, job=None):
+    """
+    Extract and analyze sections for persona relevance
+    index: optional PageIndex of documents_text; page scores are then looked up
+    instead of rescanning every page
+    ranking: "keyword" (default) scores pages with score_section_relevance;
+    "bm25" ranks them by BM25 against the persona's keywords and the job-to-be-done
+    text job (see bm25.BM25Ranker) and keeps every page that matches at least one
+    query term
+    top_k: keep only the top_k most relevant sections (bounded heap while scoring;
+    titles and refined text are only built for the winners)
+    page_scores: optional persona_page_scores of the non-empty pages of
+    documents_text, e.g. a slice of an index shared by several collections
+    dedupe: score exact and near-duplicate pages (see dedup.py) once; each
+    duplicate is collapsed into the first such page, whose section lists it
+    under "duplicate_pages"
+    """
     subsection_analysis = []
     
     all_sections = []
+    best_pages = []
+    
+    duplicates = {}
+    collapsed = defaultdict(list)  # kept page position -> pages collapsed into it
+    if dedupe:
+        duplicates = find_duplicate_pages(documents_text)
+        for (doc_index, page_index), kept in sorted(duplicates.items()):
+            page = documents_text[doc_index][page_index]
+            collapsed[kept].append({"document": page["file"], "page_number": page["page_number"]})
+    
+    min_score = 5  # Minimum relevance threshold
+    if persona_name in PERSONA_DEFINITIONS:
+        if page_scores is None and ranking == "bm25" and index is None:
+            index = PageIndex.build(documents_text, PERSONA_MATCHER)
+        if page_scores is None and index is not None:
+            page_scores = persona_page_scores(index, persona_name, ranking, job=job)
+        if ranking == "bm25":
+            min_score = 0
+    page_id = 0
     
     # Process each document
-    for doc_pages in documents_text:
-        for page in doc_pages:
+    for doc_index, doc_pages in enumerate(documents_text):
+        for page_index, page in enumerate(doc_pages):
             if not page["text"].strip():
                 continue
             
+            position = (doc_index, page_index)
+            if position in duplicates:
+                page_id += 1  # scored with the page it duplicates
+                continue
+            
             # Score this page/section
-            relevance_score, keywords = score_section_relevance(page["text"], persona_name)
+            if page_scores is not None:
+                relevance_score, keywords = page_scores[page_id]
+            else:
+                relevance_score, keywords = score_section_relevance(page["text"], persona_name)
+            page_id += 1
             
-            if relevance_score > 5:  # Minimum relevance threshold
-                # Extract section title (first meaningful line)
-                lines = page["text"].split('\n')
-                section_title = "Content Section"
-                
-                for line in lines[:5]:  # Check first 5 lines
-                    clean_line = line.strip()
-                    if len(clean_line) > 10 and len(clean_line) < 100:
-                        # Likely a title or heading
-                        section_title = clean_line
-                        break
+            if relevance_score > min_score:
+                duplicate_pages = collapsed.get(position)
+                if top_k is not None:
+                    keep_top_k(best_pages, top_k, relevance_score, page_id,
+                               (page, relevance_score, keywords, duplicate_pages))
+                    continue
                 
-                section_data = {
-                    "document": page["file"],
-                    "page_number": page["page_number"],
-                    "section_title": section_title,
-                    "relevance_score": relevance_score,
-                    "matched_keywords": keywords
-                }
-                
-                all_sections.append(section_data)
-                
-                # Create refined text for subsection analysis
-                refined_text = page["text"][:500] + "..." if len(page["text"]) > 500 else page["text"]
-                
-                subsection_analysis.append({
-                    "document": page["file"],
-                    "page_number": page["page_number"],
-                    "refined_text": refined_text.strip(),
-                    "relevance_score": relevance_score,
-                    "matched_keywords": keywords
-                })
+                append_section(all_sections, subsection_analysis, page, relevance_score, keywords, duplicate_pages)
     
-    # Sort by relevance score and assign importance ranks
-    all_sections.sort(key=lambda x: x["relevance_score"], reverse=True)
+    for page, relevance_score, keywords, duplicate_pages in top_k_in_page_order(best_pages):
+        append_section(all_sections, subsection_analysis, page, relevance_score, keywords, duplicate_pages)
     
-    for i, section in enumerate(all_sections):
-        section["importance_rank"] = i + 1
-        extracted_sections.append({
-            "document": section["document"],
-            "page_number": section["page_number"],
-            "section_title": section["section_title"],
-            "importance_rank": section["importance_rank"]
-        })
+    extracted_sections = rank_sections(all_sections)
     
     return extracted_sections, subsection_analysis
 
+def summarize_document(pages_text):
+    """
+    Per-page persona scores of one document, for reuse without re-extraction
+    
+    Keeps the document's keyword counts (for persona detection) and, for every
+    page relevant to at least one persona, its title, refined text and the
+    (score, keywords) of each persona. analyze_document_summaries turns a list
+    of these into the collection-level ranking.
+    """
+    all_text = " ".join(page["text"].lower() for page in pages_text)
+    keyword_counts, _ = PERSONA_MATCHER.scan(all_text)
+    
+    pages = []
+    for page in pages_text:
+        if not page["text"].strip():
+            continue
+        
+        scores = score_section_all_personas(page["text"])
+        if max(score for score, _ in scores.values()) <= 5:
+            continue  # below the relevance threshold for every persona
+        
+        pages.append({
+            "page_number": page["page_number"],
+            "section_title": section_title_of(page),
+            "refined_text": refine_section_text(page["text"]),
+            "scores": {persona_name: list(result) for persona_name, result in scores.items()}
+        })
+    
+    return {
+        "keyword_counts": dict(keyword_counts),
+        "pages": pages
+    }
+
+def analyze_document_summaries(document_names, summaries, top_k=None):
+    """
+    Collection-level persona detection and ranking from summarize_document results
+    top_k: keep only the top_k most relevant sections (see extract_sections_and_analyze)
+    Returns: (persona_name, persona_scores, extracted_sections, subsection_analysis)
+    """
+    keyword_counts = Counter()
+    for summary in summaries:
+        keyword_counts.update(summary["keyword_counts"])
+    
+    persona_name, persona_scores = detect_persona_from_counts(keyword_counts)
+    
+    relevant_pages = []
+    best_pages = []
+    position = 0
+    for document_name, summary in zip(document_names, summaries):
+        for page in summary["pages"]:
+            relevance_score, keywords = page["scores"][persona_name]
+            if relevance_score > 5:  # Minimum relevance threshold
+                candidate = (document_name, page, relevance_score, keywords)
+                if top_k is not None:
+                    keep_top_k(best_pages, top_k, relevance_score, position, candidate)
+                else:
+                    relevant_pages.append(candidate)
+                position += 1
+    if top_k is not None:
+        relevant_pages = top_k_in_page_order(best_pages)
+    
+    all_sections = []
+    subsection_analysis = []
+    for document_name, page, relevance_score, keywords in relevant_pages:
+        all_sections.append({
+            "document": document_name,
+            "page_number": page["page_number"],
+            "section_title": page["section_title"],
+            "relevance_score": relevance_score,
+            "matched_keywords": keywords
+        })
+        subsection_analysis.append({
+            "document": document_name,
+            "page_number": page["page_number"],
+            "refined_text": page["refined_text"],
+            "relevance_score": relevance_score,
+            "matched_keywords": keywords
+        })
+    
+    return persona_name, persona_scores, rank_sections(all_sections), subsection_analysis
+
 def generate_job_to_be_done(persona_name, documents):
     """Generate a job-to-be-done based on persona and document content"""
     job_descriptions = {
@@ -244,14 +609,86 @@ def generate_job_to_be_done(persona_name, documents):
     
     return job_descriptions.get(persona_name, f"Analyze and extract insights from {len(documents)} documents")
 
-def analyze_persona_intelligence(input_dir, output_dir):
-    """Main function for Round 1B persona-driven document intelligence"""
+# Map internal names to user-friendly names
+PERSONA_DISPLAY_NAMES = {
+    "travel_planner": "Travel Planner",
+    "hr_professional": "HR Professional", 
+    "home_cook": "Home Cook"
+}
+
+def display_persona_name(persona_name):
+    """User-friendly name of a persona"""
+    return PERSONA_DISPLAY_NAMES.get(persona_name, persona_name.replace("_", " ").title())
+
+def build_persona_output(document_names, persona_name, persona_scores, extracted_sections, subsection_analysis,
+                         job_to_be_done=None):
+    """
+    Assemble the Round 1B output structure
+    job_to_be_done: the task from a collection's spec; generated from the persona if not given
+    """
+    return {
+        "metadata": {
+            "documents": document_names,
+            "persona": display_persona_name(persona_name),
+            "job_to_be_done": job_to_be_done or generate_job_to_be_done(persona_name, document_names),
+            "timestamp": datetime.now().isoformat() + "Z",
+            "detected_persona_confidence": persona_scores[persona_name]["score"],
+            "total_sections_analyzed": len(extracted_sections)
+        },
+        "extracted_sections": extracted_sections,
+        "subsection_analysis": subsection_analysis
+    }
+
+def save_persona_output(output_path, output_data):
+    """Write persona_intelligence_output.json into output_path and return its path"""
+    output_file = Path(output_path) / "persona_intelligence_output.json"
+    
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(output_data, f, indent=2, ensure_ascii=False)
+    
+    return output_file
+
+def load_or_build_index(documents_text, index_path):
+    """Load the PageIndex at index_path if it matches documents_text, else rebuild and save it"""
+    fingerprint = collection_fingerprint(documents_text)
+    index = PageIndex.load(index_path)
+    if index is not None and index.fingerprint == fingerprint:
+        print(f"📇 Using page index: {index_path}")
+        return index
+    
+    print(f"📇 Building page index: {index_path}")
+    index = PageIndex.build(documents_text, PERSONA_MATCHER)
+    try:
+        index.save(index_path)
+    except OSError as e:
+        print(f"Could not save page index {index_path}: {e}")
+    return index
+
+def analyze_persona_intelligence(input_dir, output_dir, parsed_documents=None, index_path=None,
+                                 ranking="keyword", top_k=None, segmentation="page", pdf_files=None,
+                                 dedupe=False):
+    """
+    Main function for Round 1B persona-driven document intelligence
+    parsed_documents: optional ParsedDocument list (see document_model) to reuse
+    instead of extracting the text of every PDF in input_dir again
+    index_path: optional file for a persisted PageIndex used for section scoring
+    ranking: "keyword" or "bm25" (see extract_sections_and_analyze)
+    top_k: optional limit on the number of sections in the output
+    segmentation: "page" scores every page as one section; "heading" scores the
+    heading-bounded sections of sections.py instead
+    pdf_files: optional list of the PDFs in input_dir, if the caller already listed it
+    dedupe: score duplicate and near-duplicate pages once (see extract_sections_and_analyze)
+    """
     input_path = Path(input_dir)
     output_path = Path(output_dir)
     output_path.mkdir(exist_ok=True)
     
     # Find all PDF files
-    pdf_files = list(input_path.glob("*.pdf"))
+    if parsed_documents is None:
+        if pdf_files is None:
+            pdf_files = list(input_path.glob("*.pdf"))
+    else:
+        pdf_files = [Path(document.path) for document in parsed_documents]
     
     if not pdf_files:
         print("❌ No PDF files found for persona intelligence analysis")
@@ -263,52 +700,47 @@ def analyze_persona_intelligence(input_dir, output_dir):
     documents_text = []
     document_names = []
     
-    for pdf_file in pdf_files:
-        print(f"  📄 Processing: {pdf_file.name}")
-        pages_text = extract_text_from_pdf(pdf_file)
-        documents_text.append(pages_text)
-        document_names.append(pdf_file.name)
+    if parsed_documents is None:
+        for pdf_file in pdf_files:
+            print(f"  📄 Processing: {pdf_file.name}")
+            if segmentation == "heading":
+                pages_text = extract_sections_from_pdf(pdf_file)
+            else:
+                pages_text = extract_text_from_pdf(pdf_file)
+            documents_text.append(pages_text)
+            document_names.append(pdf_file.name)
+    else:
+        for document in parsed_documents:
+            if segmentation == "heading":
+                with timer("headings", document.path):
+                    documents_text.append(split_sections(document.spans, document.name))
+            else:
+                documents_text.append(document.pages_text())
+            document_names.append(document.name)
     
     # Detect persona
     print("\n🧠 Detecting persona...")
-    persona_name, persona_scores = detect_persona(documents_text)
+    with timer("persona_detection"):
+        persona_name, persona_scores = detect_persona(documents_text)
     
-    # Map internal names to user-friendly names
-    persona_display_names = {
-        "travel_planner": "Travel Planner",
-        "hr_professional": "HR Professional", 
-        "home_cook": "Home Cook"
-    }
-    
-    display_persona = persona_display_names.get(persona_name, persona_name.replace("_", " ").title())
+    display_persona = display_persona_name(persona_name)
     print(f"🎯 Detected persona: {display_persona}")
     
-    # Generate job-to-be-done
-    job_to_be_done = generate_job_to_be_done(persona_name, documents_text)
+    with timer("index"):
+        index = load_or_build_index(documents_text, index_path) if index_path else None
     
     # Extract and analyze sections
     print(f"\n📊 Analyzing content relevance for {display_persona}...")
-    extracted_sections, subsection_analysis = extract_sections_and_analyze(documents_text, persona_name)
-    
-    # Prepare output data
-    output_data = {
-        "metadata": {
-            "documents": document_names,
-            "persona": display_persona,
-            "job_to_be_done": job_to_be_done,
-            "timestamp": datetime.now().isoformat() + "Z",
-            "detected_persona_confidence": persona_scores[persona_name]["score"],
-            "total_sections_analyzed": len(extracted_sections)
-        },
-        "extracted_sections": extracted_sections,
-        "subsection_analysis": subsection_analysis
-    }
-    
-    # Save output
-    output_file = output_path / "persona_intelligence_output.json"
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, indent=2, ensure_ascii=False)
+    job_to_be_done = generate_job_to_be_done(persona_name, document_names)
+    with timer("scoring"):
+        extracted_sections, subsection_analysis = extract_sections_and_analyze(documents_text, persona_name, index,
+                                                                               ranking, top_k, dedupe=dedupe,
+                                                                               job=job_to_be_done)
+    
+    # Prepare and save output data
+    output_data = build_persona_output(document_names, persona_name, persona_scores,
+                                       extracted_sections, subsection_analysis, job_to_be_done)
+    output_file = save_persona_output(output_path, output_data)
     
     print(f"✅ Analysis complete!")
     print(f"📈 Found {len(extracted_sections)} relevant sections")
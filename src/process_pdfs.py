@@ -1,78 +1,216 @@
 import os
-import json
 import re
 from pathlib import Path
-import PyPDF2
-import fitz  # PyMuPDF for better text extraction with font info
-from collections import defaultdict
-import statistics
+from collections import Counter
+from fractions import Fraction
+from concurrent.futures import ProcessPoolExecutor
 
-def load_pdf(filepath):
+try:
+    import numpy as np  # optional: vectorised heading classification
+except ImportError:
+    np = None
+
+try:
+    from .extraction_cache import get_extraction_cache
+    from .metrics import timer, record_document
+    from .output_writer import write_json_atomic
+    from .pdf_source import PDFSource, open_source
+    from .span_store import SpanStore
+except ImportError:
+    from extraction_cache import get_extraction_cache
+    from metrics import timer, record_document
+    from output_writer import write_json_atomic
+    from pdf_source import PDFSource, open_source
+    from span_store import SpanStore
+
+# Bump whenever the span data produced by load_span_store changes
+SPAN_EXTRACTOR_VERSION = 2
+
+# Bump whenever the bookmark outline (bookmark_outline) of the same PDF changes
+BOOKMARK_OUTLINE_VERSION = 2
+
+# Smallest page range worth handing to a worker process in load_span_store
+MIN_PAGE_CHUNK = 25
+
+# Embedded outlines with more entries per page than this are treated as noise
+MAX_BOOKMARKS_PER_PAGE = 50
+
+# Metadata titles that are really file names left behind by authoring tools
+FILENAME_TITLE_PATTERN = re.compile(r'\.(pdf|docx?|xlsx?|pptx?|cdr|indd|ai|psd|rtf|txt|odt)$|^untitled', re.IGNORECASE)
+
+def iter_text_dict_spans(text_dict):
     """
-    Load PDF and return list of page-wise text with font information
-    Returns: list of pages, each containing text blocks with font info
+    Yield (text, font, size, flags, bbox) for every non-empty span of a page
+    text_dict is the result of PyMuPDF's page.get_text("dict"); flags carries bold, italic info
     """
-    pages = []
+    for block in text_dict["blocks"]:
+        if "lines" in block:
+            for line in block["lines"]:
+                for span in line["spans"]:
+                    text = span["text"].strip()
+                    if text:
+                        yield text, span["font"], span["size"], span["flags"], span["bbox"]
+
+def iter_pdf_page_spans(filepath):
+    """
+    Lazily yield (page_num, spans) straight from PyMuPDF, one page at a time
+    Each span is a (text, size, flags) tuple; only one page is held in memory
+    """
+    with PDFSource(filepath) as source:
+        doc = source.open_fitz()
+        try:
+            for page_num in range(len(doc)):
+                page = doc.load_page(page_num)
+                spans = [
+                    (text, size, flags)
+                    for text, _, size, flags, _ in iter_text_dict_spans(page.get_text("dict"))
+                ]
+                yield page_num, spans
+        finally:
+            doc.close()
+
+def extract_pages(doc, start, end):
+    """Extract pages [start, end) of an open PyMuPDF document into a SpanStore"""
+    store = SpanStore()
+    for page_num in range(start, end):
+        page = doc.load_page(page_num)
+        
+        # Extract text blocks with font information
+        for span in iter_text_dict_spans(page.get_text("dict")):
+            store.add_span(*span)
+        
+        store.end_page(page_num)  # 0-based indexing
+    return store
+
+def extract_page_range(source, start, end):
+    """
+    Extract pages [start, end) of a PDF into a SpanStore
+    source is a file path or a pdf_source.SharedPDF handle; with the latter a
+    worker process reads the parent's shared copy instead of the file
+    """
+    with open_source(source) as pdf:
+        doc = pdf.open_fitz()
+        try:
+            return extract_pages(doc, start, end)
+        finally:
+            doc.close()
+
+def page_chunks(page_count, workers, min_chunk=MIN_PAGE_CHUNK):
+    """Split range(page_count) into (start, end) chunks, ~4 per worker for load balancing"""
+    chunk_size = max(min_chunk, -(-page_count // (workers * 4)))
+    return [(start, min(start + chunk_size, page_count)) for start in range(0, page_count, chunk_size)]
+
+def load_span_store(filepath, page_workers=1, min_chunk=MIN_PAGE_CHUNK, source=None, doc=None):
+    """
+    Load PDF into a columnar SpanStore (text, font, size, flags and bbox per span)
+    Returns: SpanStore with one entry per page; empty if the PDF cannot be read
+    
+    The file is mapped once (see pdf_source) and that buffer serves the cache
+    digest, PyMuPDF and the PyPDF2 fallback. With page_workers > 1, a document
+    with more than min_chunk pages is split into page ranges extracted by worker
+    processes from a shared memory copy; chunks are merged back in page order.
+    source, doc: an open PDFSource of filepath (and a PyMuPDF document over it)
+    to reuse instead of opening the file again; the caller closes them
+    """
+    if source is None:
+        try:
+            source = PDFSource(filepath)
+        except OSError as e:
+            print(f"Error loading PDF {filepath}: {e}")
+            return SpanStore()
+        
+        with source:
+            return load_span_store(filepath, page_workers, min_chunk, source)
+    
+    cache = get_extraction_cache()
+    cache_key = None
+    if cache is not None:
+        try:
+            cache_key = cache.key_for(filepath, "spans", SPAN_EXTRACTOR_VERSION, digest=source.digest())
+            cached_store = cache.get(cache_key)
+            if cached_store is not None:
+                return SpanStore.from_dict(cached_store)
+        except OSError as e:
+            print(f"Cache lookup failed for {filepath}: {e}")
+    
+    store = SpanStore()
     try:
         # Use PyMuPDF for better font information extraction
-        doc = fitz.open(filepath)
-        
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
-            
-            # Extract text blocks with font information
-            text_dict = page.get_text("dict")
-            
-            page_blocks = []
-            for block in text_dict["blocks"]:
-                if "lines" in block:
-                    for line in block["lines"]:
-                        for span in line["spans"]:
-                            if span["text"].strip():
-                                page_blocks.append({
-                                    "text": span["text"].strip(),
-                                    "font": span["font"],
-                                    "size": span["size"],
-                                    "flags": span["flags"],  # bold, italic info
-                                    "bbox": span["bbox"]
-                                })
+        own_doc = doc is None
+        if own_doc:
+            doc = source.open_fitz()
+        try:
+            page_count = len(doc)
             
-            pages.append({
-                "page_num": page_num,  # 0-based indexing
-                "blocks": page_blocks
-            })
+            chunks = page_chunks(page_count, page_workers, min_chunk)
+            with timer("extract", filepath):
+                if page_workers > 1 and len(chunks) > 1:
+                    with source.share() as shared, \
+                            ProcessPoolExecutor(max_workers=min(page_workers, len(chunks))) as executor:
+                        chunk_stores = executor.map(
+                            extract_page_range,
+                            [shared] * len(chunks),
+                            [start for start, _ in chunks],
+                            [end for _, end in chunks]
+                        )
+                        for chunk_store in chunk_stores:
+                            store.extend(chunk_store)
+                else:
+                    store = extract_pages(doc, 0, page_count)
+        finally:
+            if own_doc:
+                doc.close()
         
-        doc.close()
-        return pages
+        if cache_key is not None:
+            cache.put(cache_key, store.to_dict())
+        
+        return store
     
     except Exception as e:
         print(f"Error loading PDF {filepath}: {e}")
-        # Fallback to PyPDF2 for basic text extraction
+        # Fallback to PyPDF2 for basic text extraction, from the same buffer
         try:
-            pages = []
-            with open(filepath, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page_num, page in enumerate(pdf_reader.pages):
-                    text = page.extract_text()
-                    # Create basic blocks without font info
-                    blocks = []
-                    for line in text.split('\n'):
-                        if line.strip():
-                            blocks.append({
-                                "text": line.strip(),
-                                "font": "unknown",
-                                "size": 12,
-                                "flags": 0,
-                                "bbox": [0, 0, 0, 0]
-                            })
-                    pages.append({
-                        "page_num": page_num,  # 0-based indexing
-                        "blocks": blocks
-                    })
-            return pages
+            store = SpanStore()
+            pdf_reader = source.pypdf2_reader()
+            for page_num, page in enumerate(pdf_reader.pages):
+                text = page.extract_text()
+                # Create basic spans without font info
+                for line in text.split('\n'):
+                    if line.strip():
+                        store.add_span(line.strip(), "unknown", 12, 0, (0, 0, 0, 0))
+                store.end_page(page_num)  # 0-based indexing
+            return store
         except Exception as e2:
             print(f"Fallback extraction also failed: {e2}")
-            return []
+            return SpanStore()
+
+def load_pdf(filepath):
+    """
+    Load PDF and return list of page-wise text with font information
+    Returns: list of pages, each containing text blocks with font info
+    
+    Legacy dict view of load_span_store, kept for external callers.
+    """
+    return load_span_store(filepath).to_pages()
+
+def page_spans(pages):
+    """
+    Yield (page_num, spans) for either a SpanStore or the legacy page list
+    Each span is a (text, size, flags) tuple
+    """
+    if isinstance(pages, SpanStore):
+        yield from pages.iter_pages()
+    else:
+        for page in pages:
+            yield page["page_num"], [
+                (block["text"], block["size"], block["flags"]) for block in page["blocks"]
+            ]
+
+def first_page_spans(pages):
+    """(text, size, flags) spans of the first page of a SpanStore or page list"""
+    if isinstance(pages, SpanStore):
+        return pages.page_spans(0)
+    return [(block["text"], block["size"], block["flags"]) for block in pages[0]["blocks"]]
 
 def extract_title(pages):
     """
@@ -82,30 +220,36 @@ def extract_title(pages):
     if not pages:
         return ""
     
-    first_page = pages[0]
-    if not first_page["blocks"]:
+    return select_title(first_page_spans(pages))
+
+def select_title(first_page):
+    """
+    Pick the title among the first page's (text, size, flags) spans
+    Logic: Look for largest font size text in first page, or first significant text
+    """
+    if not first_page:
         return ""
     
     # Find the largest font size in first page
-    font_sizes = [block["size"] for block in first_page["blocks"] if block["text"]]
+    font_sizes = [size for text, size, _ in first_page if text]
     if not font_sizes:
         return ""
     
     max_font_size = max(font_sizes)
     
     # Look for text with largest font size
-    for block in first_page["blocks"]:
-        if block["size"] == max_font_size and len(block["text"]) > 3:
-            title = block["text"].strip()
+    for text, size, _ in first_page:
+        if size == max_font_size and len(text) > 3:
+            title = text.strip()
             # Clean up title
             title = re.sub(r'^[^\w\s]+|[^\w\s]+$', '', title)
             if title:
                 return title
     
     # Fallback: use first substantial text
-    for block in first_page["blocks"]:
-        if len(block["text"]) > 5:
-            title = block["text"].strip()
+    for text, _, _ in first_page:
+        if len(text) > 5:
+            title = text.strip()
             title = re.sub(r'^[^\w\s]+|[^\w\s]+$', '', title)
             if title:
                 return title
@@ -137,9 +281,9 @@ def is_heading_by_pattern(text):
     
     return False
 
-def determine_heading_level(text, font_size, font_flags, avg_font_size, font_size_levels):
+def pattern_heading_level(text):
     """
-    Determine heading level based on font size, style, and text patterns
+    Heading level implied by the text alone (numbering, chapter/section), or None
     """
     # Check for explicit numbering patterns
     if re.match(r'^\d+\.\s+', text):
@@ -153,6 +297,23 @@ def determine_heading_level(text, font_size, font_flags, avg_font_size, font_siz
     if re.match(r'^(Chapter|Section)\s+\d+', text, re.IGNORECASE):
         return "H1"
     
+    return None
+
+def clean_heading_text(text):
+    """Strip leading section numbering from a heading"""
+    clean_text = re.sub(r'^\d+\.\s*', '', text)  # Remove numbering
+    clean_text = re.sub(r'^\d+\.\d+\s*', '', clean_text)
+    clean_text = re.sub(r'^\d+\.\d+\.\d+\s*', '', clean_text)
+    return clean_text.strip()
+
+def determine_heading_level(text, font_size, font_flags, avg_font_size, font_size_levels):
+    """
+    Determine heading level based on font size, style, and text patterns
+    """
+    level = pattern_heading_level(text)
+    if level:
+        return level
+    
     # Use font size to determine level
     if font_size_levels:
         sorted_sizes = sorted(font_size_levels.keys(), reverse=True)
@@ -174,6 +335,92 @@ def determine_heading_level(text, font_size, font_flags, avg_font_size, font_siz
     
     return None
 
+def count_font_sizes(pages):
+    """Histogram of font sizes over the spans used for document statistics"""
+    font_size_counts = Counter()
+    for _, spans in pages:
+        for text, size, _ in spans:
+            if text and len(text) > 3:
+                font_size_counts[size] += 1
+    return font_size_counts
+
+def font_statistics(font_size_counts):
+    """
+    Average font size and candidate heading sizes from a font size histogram
+    Returns: (avg_font_size, heading_font_sizes), or None if there is no text
+    """
+    total = sum(font_size_counts.values())
+    if not total:
+        return None
+    
+    # Exact mean, identical to statistics.mean over the expanded sizes
+    avg_font_size = float(sum(Fraction(size) * count for size, count in font_size_counts.items()) / total)
+    
+    # Find distinct font sizes that could be headings
+    heading_font_sizes = {}
+    for size, count in font_size_counts.items():
+        if size > avg_font_size and count < total * 0.1:  # Less than 10% of text
+            heading_font_sizes[size] = count
+    
+    return avg_font_size, heading_font_sizes
+
+def is_heading_span(text, font_size, font_flags, avg_font_size):
+    """
+    Whether a stripped span of 3-200 characters looks like a heading
+    (numbering pattern, larger font, bold or all caps); the level is decided
+    separately by determine_heading_level
+    """
+    # Method 1: Pattern-based detection
+    if is_heading_by_pattern(text):
+        return True
+    
+    # Method 2: Font size-based detection
+    if font_size > avg_font_size * 1.1:
+        return True
+    
+    # Method 3: Bold text detection
+    if font_flags & 2**4:  # Bold flag
+        return len(text) < 100  # Not too long
+    
+    # Method 4: All caps detection
+    return text.isupper() and len(text) > 5 and len(text) < 100
+
+def classify_page_headings(page_num, spans, avg_font_size, heading_font_sizes):
+    """
+    Find the headings among one page's (text, size, flags) spans
+    Returns: list of {level, text, page} dictionaries without duplicates
+    """
+    headings = []
+    seen = set()
+    
+    for span_text, font_size, font_flags in spans:
+        text = span_text.strip()
+        
+        if not text or len(text) < 3:
+            continue
+        
+        # Skip very long text (likely paragraphs)
+        if len(text) > 200:
+            continue
+        
+        # Check if this could be a heading
+        if is_heading_span(text, font_size, font_flags, avg_font_size):
+            level = determine_heading_level(text, font_size, font_flags, avg_font_size, heading_font_sizes)
+            if level:
+                # Clean up heading text
+                clean_text = clean_heading_text(text)
+                
+                key = (level, clean_text)
+                if clean_text and key not in seen:
+                    seen.add(key)
+                    headings.append({
+                        "level": level,
+                        "text": clean_text,
+                        "page": page_num
+                    })
+    
+    return headings
+
 def extract_headings(pages):
     """
     Extract hierarchical headings from all pages
@@ -182,83 +429,20 @@ def extract_headings(pages):
     if not pages:
         return []
     
-    headings = []
+    if np is not None and isinstance(pages, SpanStore):
+        return extract_headings_vectorized(pages)
     
     # Collect all font sizes to understand document structure
-    all_font_sizes = []
-    for page in pages:
-        for block in page["blocks"]:
-            if block["text"] and len(block["text"]) > 3:
-                all_font_sizes.append(block["size"])
-    
-    if not all_font_sizes:
+    stats = font_statistics(count_font_sizes(page_spans(pages)))
+    if stats is None:
         return []
     
-    avg_font_size = statistics.mean(all_font_sizes)
-    
-    # Group font sizes to identify heading levels
-    font_size_counts = defaultdict(int)
-    for size in all_font_sizes:
-        font_size_counts[size] += 1
-    
-    # Find distinct font sizes that could be headings
-    heading_font_sizes = {}
-    for size, count in font_size_counts.items():
-        if size > avg_font_size and count < len(all_font_sizes) * 0.1:  # Less than 10% of text
-            heading_font_sizes[size] = count
+    avg_font_size, heading_font_sizes = stats
     
     # Process each page
-    for page in pages:
-        page_num = page["page_num"]
-        
-        for block in page["blocks"]:
-            text = block["text"].strip()
-            
-            if not text or len(text) < 3:
-                continue
-            
-            # Skip very long text (likely paragraphs)
-            if len(text) > 200:
-                continue
-            
-            font_size = block["size"]
-            font_flags = block["flags"]
-            
-            # Check if this could be a heading
-            is_heading = False
-            
-            # Method 1: Pattern-based detection
-            if is_heading_by_pattern(text):
-                is_heading = True
-            
-            # Method 2: Font size-based detection
-            elif font_size > avg_font_size * 1.1:
-                is_heading = True
-            
-            # Method 3: Bold text detection
-            elif font_flags & 2**4:  # Bold flag
-                if len(text) < 100:  # Not too long
-                    is_heading = True
-            
-            # Method 4: All caps detection
-            elif text.isupper() and len(text) > 5 and len(text) < 100:
-                is_heading = True
-            
-            if is_heading:
-                level = determine_heading_level(text, font_size, font_flags, avg_font_size, heading_font_sizes)
-                if level:
-                    # Clean up heading text
-                    clean_text = re.sub(r'^\d+\.\s*', '', text)  # Remove numbering
-                    clean_text = re.sub(r'^\d+\.\d+\s*', '', clean_text)
-                    clean_text = re.sub(r'^\d+\.\d+\.\d+\s*', '', clean_text)
-                    clean_text = clean_text.strip()
-                    
-                    if clean_text:
-                        headings.append({
-                            "level": level,
-                            "text": clean_text,
-                            "page": page_num
-                        })
+    headings = []
+    for page_num, spans in page_spans(pages):
+        headings.extend(classify_page_headings(page_num, spans, avg_font_size, heading_font_sizes))
     
     # Remove duplicates and sort by page
     seen = set()
@@ -274,12 +458,150 @@ def extract_headings(pages):
     
     return unique_headings
 
+# Only spans starting with one of these (or a non-ASCII character) can match the
+# numbering / "Chapter N" / "Section N" patterns that set a level from text alone
+PATTERN_LEVEL_FIRST_CHARS = "0123456789cCsS"
+
+def extract_headings_vectorized(store):
+    """
+    NumPy version of extract_headings for a SpanStore, with identical output
+    
+    Font statistics, heading size tiers and the size-based H1/H2/H3 level are
+    computed as array operations over all spans. Only spans that can still
+    become a heading (a size-based level, or text that may carry a numbering
+    or chapter pattern) go through the per-span pattern checks.
+    """
+    if not store.span_count:
+        return []
+    
+    sizes = np.frombuffer(store.sizes, dtype=np.float64)
+    flags = np.frombuffer(store.flags, dtype=np.int32)
+    offsets = np.frombuffer(store.text_offsets, dtype=np.int64)
+    lengths = np.diff(offsets)  # span text is stored stripped
+    
+    # Font size histogram over substantial spans
+    unique_sizes, counts = np.unique(sizes[lengths > 3], return_counts=True)
+    stats = font_statistics(dict(zip(unique_sizes.tolist(), counts.tolist())))
+    if stats is None:
+        return []
+    
+    avg_font_size, heading_font_sizes = stats
+    tiers = sorted(heading_font_sizes, reverse=True)[:3]
+    
+    # Size-based level (1-3, 0 for none), same precedence as determine_heading_level
+    conditions = [sizes >= tier for tier in tiers]
+    conditions += [sizes > avg_font_size * 1.5, sizes > avg_font_size * 1.2, sizes > avg_font_size * 1.1]
+    size_levels = np.select(conditions, [1, 2, 3][:len(tiers)] + [1, 2, 3], 0)
+    
+    # First character of every span, to find spans a text pattern could level
+    text = store.text
+    code_points = np.frombuffer(text.encode('utf-32-le'), dtype='<u4')
+    starts = offsets[:-1]
+    first_chars = np.zeros(len(starts), dtype=np.uint32)
+    non_empty = lengths > 0
+    first_chars[non_empty] = code_points[starts[non_empty]]
+    pattern_chars = np.array([ord(char) for char in PATTERN_LEVEL_FIRST_CHARS], dtype=np.uint32)
+    may_match_pattern = np.isin(first_chars, pattern_chars) | (first_chars >= 128)
+    
+    candidates = np.flatnonzero(
+        (lengths >= 3) & (lengths <= 200) & ((size_levels > 0) | may_match_pattern)
+    )
+    
+    page_offsets = np.frombuffer(store.page_offsets, dtype=np.int64)
+    candidate_pages = np.searchsorted(page_offsets, candidates, side='right') - 1
+    
+    level_names = [None, "H1", "H2", "H3"]
+    bold_flag = 2**4
+    size_threshold = avg_font_size * 1.1
+    
+    headings = []
+    seen = set()
+    for index, page_index in zip(candidates.tolist(), candidate_pages.tolist()):
+        span_text = text[offsets[index]:offsets[index + 1]].strip()
+        text_length = len(span_text)
+        if text_length < 3:
+            continue
+        
+        # Same criteria as classify_page_headings
+        is_heading = (
+            is_heading_by_pattern(span_text)
+            or sizes[index] > size_threshold
+            or (flags[index] & bold_flag and text_length < 100)
+            or (span_text.isupper() and 5 < text_length < 100)
+        )
+        if not is_heading:
+            continue
+        
+        level = pattern_heading_level(span_text) or level_names[size_levels[index]]
+        if not level:
+            continue
+        
+        clean_text = clean_heading_text(span_text)
+        page_num = store.page_nums[page_index]
+        key = (level, clean_text, page_num)
+        if clean_text and key not in seen:
+            seen.add(key)
+            headings.append({
+                "level": level,
+                "text": clean_text,
+                "page": page_num
+            })
+    
+    # Sort by page number
+    headings.sort(key=lambda x: x["page"])
+    
+    return headings
+
+def iter_headings_streaming(filepath, avg_font_size, heading_font_sizes):
+    """Yield headings page by page, re-reading the PDF lazily (second streaming pass)"""
+    for page_num, spans in iter_pdf_page_spans(filepath):
+        yield from classify_page_headings(page_num, spans, avg_font_size, heading_font_sizes)
+
+def process_pdf_to_outline_streaming(pdf_path):
+    """
+    Bounded-memory variant of process_pdf_to_outline for very large PDFs
+    
+    The first pass over the pages only keeps the font size histogram and the
+    first page's spans (for the title); the second pass re-reads pages one at a
+    time and yields headings. Peak memory no longer grows with page count, at
+    the cost of parsing each page twice. Produces the same outline as the
+    in-memory path, which is also used as the fallback on any error.
+    """
+    try:
+        title_spans = None
+        font_size_counts = Counter()
+        with timer("extract", pdf_path):
+            for page_num, spans in iter_pdf_page_spans(pdf_path):
+                if title_spans is None:
+                    title_spans = spans
+                font_size_counts.update(count_font_sizes([(page_num, spans)]))
+        
+        if title_spans is None:
+            # No pages: let the in-memory path (and its fallback) decide
+            return process_pdf_to_outline(pdf_path, use_bookmarks=False)
+        
+        title = select_title(title_spans)
+        
+        stats = font_statistics(font_size_counts)
+        # The second pass re-reads every page, so its time counts as heading detection
+        with timer("headings", pdf_path):
+            outline = list(iter_headings_streaming(pdf_path, *stats)) if stats else []
+        
+        return {
+            "title": title,
+            "outline": outline
+        }
+    
+    except Exception as e:
+        print(f"Streaming extraction failed for {pdf_path}: {e}")
+        return process_pdf_to_outline(pdf_path, use_bookmarks=False)
+
 def save_json(output_path, data):
     """
     Save data to JSON file in the required format
+    Written to a temporary file and renamed, so readers never see a partial file
     """
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    write_json_atomic(output_path, data)
 
 def process_pdfs():
     """
@@ -306,7 +628,7 @@ def process_pdfs():
         
         try:
             # Load PDF
-            pages = load_pdf(pdf_file)
+            pages = load_span_store(pdf_file)
             
             if not pages:
                 print(f"Could not extract text from {pdf_file.name}")
@@ -342,33 +664,223 @@ def process_pdfs():
             output_file = output_dir / f"{pdf_file.stem}.json"
             save_json(output_file, output_data)
 
-def process_pdf_to_outline(pdf_path):
+def process_pdf_to_outline(pdf_path, streaming=False, page_workers=1, use_bookmarks=True):
     """
     Unified interface function for processing a single PDF file
     Returns the outline data structure for use by main.py
+    With use_bookmarks=True, a valid embedded outline is returned directly (see bookmark_outline)
+    With streaming=True, pages are processed one at a time (see process_pdf_to_outline_streaming)
+    With page_workers > 1, page ranges of large PDFs are extracted in parallel (see load_span_store)
     """
+    if streaming:
+        if use_bookmarks:
+            outline = None
+            try:
+                with timer("bookmarks", pdf_path):
+                    outline = load_bookmark_outline(pdf_path)
+            except Exception as e:
+                print(f"Could not read bookmarks of {pdf_path}: {e}")
+            if outline is not None:
+                return outline
+        return process_pdf_to_outline_streaming(pdf_path)
+    
     try:
-        # Load PDF
-        pages = load_pdf(pdf_path)
-        
-        if not pages:
+        source = PDFSource(pdf_path)
+    except OSError as e:
+        print(f"Error processing {pdf_path}: {e}")
+        return {"title": "", "outline": []}
+    
+    # One mapping and (on a cache miss) one PyMuPDF document serve the
+    # bookmark probe and the span extraction
+    with source:
+        doc = None
+        try:
+            if use_bookmarks:
+                try:
+                    with timer("bookmarks", pdf_path):
+                        outline, doc = probe_bookmark_outline(pdf_path, source)
+                    if outline is not None:
+                        return outline
+                except Exception as e:
+                    print(f"Could not read bookmarks of {pdf_path}: {e}")
+            
+            # Load PDF
+            pages = load_span_store(pdf_path, page_workers=page_workers, source=source, doc=doc)
+            record_document(pdf_path, len(pages), pages.span_count)
+            
+            with timer("headings", pdf_path):
+                return outline_from_pages(pages)
+            
+        except Exception as e:
+            print(f"Error processing {pdf_path}: {e}")
             return {"title": "", "outline": []}
+        finally:
+            if doc is not None:
+                doc.close()
+
+def process_pdf_to_title(pdf_path):
+    """
+    Title-only variant of process_pdf_to_outline, for catalogue indexing
+    Only page 0 is opened and extracted, so the cost per document does not grow
+    with page count. Same selection logic as extract_title (select_title).
+    Returns: {"title": title}
+    """
+    try:
+        source = PDFSource(pdf_path)
+    except OSError as e:
+        print(f"Error loading PDF {pdf_path}: {e}")
+        return {"title": ""}
+    
+    with source:
+        try:
+            doc = source.open_fitz()
+            try:
+                first_page = []
+                if len(doc):
+                    with timer("extract", pdf_path):
+                        first_page = [
+                            (text, size, flags)
+                            for text, _, size, flags, _ in iter_text_dict_spans(doc.load_page(0).get_text("dict"))
+                        ]
+            finally:
+                doc.close()
+            
+            return {"title": select_title(first_page)}
         
-        # Extract title
-        title = extract_title(pages)
-        
-        # Extract headings
-        outline = extract_headings(pages)
-        
-        # Return structured data
-        return {
-            "title": title,
-            "outline": outline
+        except Exception as e:
+            print(f"Error loading PDF {pdf_path}: {e}")
+            # Fallback to PyPDF2, first page only
+            try:
+                pdf_reader = source.pypdf2_reader()
+                if not pdf_reader.pages:
+                    return {"title": ""}
+                text = pdf_reader.pages[0].extract_text()
+                first_page = [(line.strip(), 12, 0) for line in text.split('\n') if line.strip()]
+                return {"title": select_title(first_page)}
+            except Exception as e2:
+                print(f"Fallback extraction also failed: {e2}")
+                return {"title": ""}
+
+def outline_from_bookmarks(toc, page_count):
+    """
+    Convert an embedded table of contents (PyMuPDF get_toc()) into outline entries
+    Returns: list of {level, text, page} dictionaries, or None if the bookmarks
+    fail the quality checks and the font heuristics should be used instead
+    """
+    if not toc or len(toc) > page_count * MAX_BOOKMARKS_PER_PAGE:
+        return None
+    
+    # Entries with blank titles carry nothing to show and are skipped
+    entries = [(level, title.strip(), page) for level, title, page in toc if title.strip()]
+    if not entries:
+        return None
+    
+    # A well-formed tree starts at level 1 and never skips a level going down
+    previous_level = 0
+    for level, title, page in entries:
+        if level > previous_level + 1 or not 1 <= page <= page_count:
+            return None
+        previous_level = level
+    
+    # The output schema only has H1-H3; deeper bookmarks are dropped
+    return [
+        {
+            "level": f"H{level}",
+            "text": title,
+            "page": page - 1  # 0-based like the heuristic path
         }
-        
-    except Exception as e:
-        print(f"Error processing {pdf_path}: {e}")
+        for level, title, page in entries if level <= 3
+    ]
+
+def metadata_title(metadata):
+    """Document title from PDF metadata, or "" if missing or just a file name"""
+    title = (metadata or {}).get("title") or ""
+    title = title.strip()
+    if not title or FILENAME_TITLE_PATTERN.search(title):
+        return ""
+    return title
+
+def bookmark_outline(doc):
+    """
+    Fast path for PDFs with an embedded outline (bookmarks), on an open PyMuPDF document
+    Reads the table of contents and metadata; only page 0 is extracted, and
+    only when the metadata has no usable title. Returns None when the document
+    has no bookmarks that pass outline_from_bookmarks' checks.
+    """
+    outline = outline_from_bookmarks(doc.get_toc(simple=True), len(doc))
+    if outline is None:
+        return None
+    
+    title = metadata_title(doc.metadata)
+    if not title:
+        first_page = [
+            (text, size, flags)
+            for text, _, size, flags, _ in iter_text_dict_spans(doc.load_page(0).get_text("dict"))
+        ]
+        title = select_title(first_page)
+    
+    return {
+        "title": title,
+        "outline": outline
+    }
+
+def load_bookmark_outline(filepath):
+    """bookmark_outline of a PDF file"""
+    with PDFSource(filepath) as source:
+        doc = source.open_fitz()
+        try:
+            return bookmark_outline(doc)
+        finally:
+            doc.close()
+
+def probe_bookmark_outline(filepath, source):
+    """
+    bookmark_outline of an open PDFSource, looked up in the extraction cache first
+    Returns: (outline or None, the PyMuPDF document opened for the probe or None)
+    On a cache hit nothing is opened; otherwise the caller reuses the returned
+    document for span extraction and closes it.
+    """
+    cache = get_extraction_cache()
+    cache_key = None
+    if cache is not None:
+        try:
+            cache_key = cache.key_for(filepath, "bookmarks", BOOKMARK_OUTLINE_VERSION, digest=source.digest())
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached["outline"], None
+        except OSError as e:
+            print(f"Cache lookup failed for {filepath}: {e}")
+    
+    doc = source.open_fitz()
+    try:
+        outline = bookmark_outline(doc)
+    except Exception:
+        doc.close()
+        raise
+    
+    if cache_key is not None:
+        cache.put(cache_key, {"outline": outline})
+    return outline, doc
+
+def outline_from_pages(pages):
+    """
+    Build the {"title", "outline"} structure from already loaded pages
+    pages is a SpanStore or the legacy page list
+    """
+    if not pages:
         return {"title": "", "outline": []}
+    
+    # Extract title
+    title = extract_title(pages)
+    
+    # Extract headings
+    outline = extract_headings(pages)
+    
+    # Return structured data
+    return {
+        "title": title,
+        "outline": outline
+    }
 
 if __name__ == "__main__":
     print("🚀 Adobe India Hackathon - Round 1A: PDF Outline Extractor")
@@ -0,0 +1,220 @@
+"""
+Per-document time and memory budgets for Round 1A
+
+process_pdf_guarded runs the extraction in a supervised child process that
+sends every extracted page back over a pipe as soon as it is done. The parent
+enforces the budgets:
+
+- document_seconds: wall time for the whole document
+- page_seconds: longest time without a finished page (a stalled page)
+- memory_mb: address space limit of the child (RLIMIT_AS, Unix only)
+
+When a budget is exceeded (or the child fails) the child is killed and the
+document degrades instead of stalling the batch: the outline is built from
+the pages that were finished, or, if none were, from a plain-text pass over
+the first few pages under the same budgets. Degraded outputs carry
+"partial": true plus the reason and the number of pages used, so the worst
+case per document is about twice document_seconds.
+
+The child is started with forkserver (spawn where that is unavailable), never
+by forking the caller: the caller may run other threads (the output writer,
+--workers threads), and a forked child could deadlock on a lock one of them
+held, which would surface as a spurious page_timeout. The forkserver preloads
+this module, so each child starts with PyMuPDF already imported.
+"""
+
+import time
+import multiprocessing
+from collections import namedtuple
+
+try:
+    import resource  # Unix only: memory budget
+except ImportError:
+    resource = None
+
+try:
+    from .extraction_cache import configure_pool_worker, pool_worker_args
+    from .pdf_source import PDFSource
+    from .span_store import SpanStore
+    from .process_pdfs import extract_pages, probe_bookmark_outline, outline_from_pages
+except ImportError:
+    from extraction_cache import configure_pool_worker, pool_worker_args
+    from pdf_source import PDFSource
+    from span_store import SpanStore
+    from process_pdfs import extract_pages, probe_bookmark_outline, outline_from_pages
+
+ExtractionBudget = namedtuple(
+    "ExtractionBudget", ["document_seconds", "page_seconds", "memory_mb", "fallback_pages"]
+)
+
+DEFAULT_BUDGET = ExtractionBudget(document_seconds=60.0, page_seconds=10.0, memory_mb=None, fallback_pages=5)
+
+def supervisor_context():
+    """Multiprocessing context for the supervised children: forkserver, or spawn without it"""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context("spawn")
+
+def make_budget(document_seconds=None, page_seconds=None, memory_mb=None, fallback_pages=None):
+    """ExtractionBudget with DEFAULT_BUDGET values for everything not given"""
+    return ExtractionBudget(
+        DEFAULT_BUDGET.document_seconds if document_seconds is None else document_seconds,
+        DEFAULT_BUDGET.page_seconds if page_seconds is None else page_seconds,
+        DEFAULT_BUDGET.memory_mb if memory_mb is None else memory_mb,
+        DEFAULT_BUDGET.fallback_pages if fallback_pages is None else fallback_pages
+    )
+
+def text_page_store(text, page_num):
+    """One page of plain text as a SpanStore, without font info (like the PyPDF2 fallback)"""
+    store = SpanStore()
+    for line in text.split('\n'):
+        if line.strip():
+            store.add_span(line.strip(), "unknown", 12, 0, (0, 0, 0, 0))
+    store.end_page(page_num)
+    return store
+
+def iter_page_stores(source, mode, max_pages=None, doc=None):
+    """
+    Yield a one-page SpanStore per page of a PDFSource
+    mode "spans" extracts font info like load_span_store, "text" only plain text;
+    documents PyMuPDF cannot open are read as plain text with PyPDF2
+    doc: an already open PyMuPDF document of source to reuse (the caller closes it)
+    """
+    own_doc = doc is None
+    if own_doc:
+        try:
+            doc = source.open_fitz()
+        except Exception as e:
+            print(f"Error loading PDF {source.path}: {e}")
+            pdf_reader = source.pypdf2_reader()
+            for page_num, page in enumerate(pdf_reader.pages[:max_pages]):
+                yield text_page_store(page.extract_text(), page_num)
+            return
+
+    try:
+        page_count = min(len(doc), max_pages) if max_pages else len(doc)
+        for page_num in range(page_count):
+            if mode == "text":
+                yield text_page_store(doc.load_page(page_num).get_text(), page_num)
+            else:
+                yield extract_pages(doc, page_num, page_num + 1)
+    finally:
+        if own_doc:
+            doc.close()
+
+def guarded_extraction(conn, pdf_path, mode, memory_mb, use_bookmarks, max_pages, worker_args):
+    """
+    Child process side: send ("outline", result) for usable bookmarks, else
+    ("page", store dict) per page, then ("done", None); ("error", reason) on failure
+    worker_args: the parent's pool_worker_args (extraction cache and metrics file)
+    """
+    configure_pool_worker(*worker_args)
+    if memory_mb and resource is not None:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    try:
+        with PDFSource(pdf_path) as source:
+            doc = None  # PyMuPDF document of the bookmark probe, reused for the pages
+            try:
+                if use_bookmarks and mode == "spans":
+                    try:
+                        outline, doc = probe_bookmark_outline(pdf_path, source)
+                        if outline is not None:
+                            conn.send(("outline", outline))
+                            return
+                    except Exception as e:
+                        print(f"Could not read bookmarks of {pdf_path}: {e}")
+
+                for store in iter_page_stores(source, mode, max_pages, doc):
+                    conn.send(("page", store.to_dict()))
+            finally:
+                if doc is not None:
+                    doc.close()
+        conn.send(("done", None))
+
+    except MemoryError:
+        conn.send(("error", "memory"))
+    except Exception as e:
+        # MuPDF reports failed allocations as generic errors
+        conn.send(("error", "memory" if "memory" in str(e).lower() else "error"))
+    finally:
+        conn.close()
+
+def run_supervised(pdf_path, budget, mode, use_bookmarks=True, max_pages=None):
+    """
+    Run guarded_extraction in a child process under budget
+    Returns: (outline or None, SpanStore of finished pages, failure reason or None)
+    """
+    context = supervisor_context()
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(
+        target=guarded_extraction,
+        args=(sender, str(pdf_path), mode, budget.memory_mb, use_bookmarks, max_pages, pool_worker_args()),
+        daemon=True
+    )
+    process.start()
+    sender.close()
+
+    store = SpanStore()
+    outline = None
+    reason = None
+    deadline = time.monotonic() + budget.document_seconds
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                reason = "document_timeout"
+                break
+            if not receiver.poll(min(remaining, budget.page_seconds)):
+                reason = "document_timeout" if time.monotonic() >= deadline else "page_timeout"
+                break
+
+            try:
+                kind, value = receiver.recv()
+            except EOFError:
+                reason = "worker_died"  # e.g. killed for exceeding memory
+                break
+
+            if kind == "page":
+                store.extend(SpanStore.from_dict(value))
+            elif kind == "outline":
+                outline = value
+                break
+            elif kind == "done":
+                break
+            else:
+                reason = value
+                break
+    finally:
+        receiver.close()
+        if process.is_alive():
+            process.kill()
+        process.join()
+
+    return outline, store, reason
+
+def process_pdf_guarded(pdf_path, budget=DEFAULT_BUDGET, use_bookmarks=True):
+    """
+    process_pdf_to_outline under an ExtractionBudget
+    Returns the same outline as process_pdf_to_outline when the document fits the
+    budget; otherwise a degraded outline with "partial", "partial_reason" and
+    "pages_processed" added
+    """
+    outline, store, reason = run_supervised(pdf_path, budget, "spans", use_bookmarks)
+    if outline is not None:
+        return outline
+    if reason is None:
+        return outline_from_pages(store)
+
+    print(f"⚠️  {pdf_path}: {reason.replace('_', ' ')}, degrading extraction")
+    if not len(store):
+        _, store, _ = run_supervised(pdf_path, budget, "text", max_pages=budget.fallback_pages)
+
+    outline = outline_from_pages(store) if len(store) else {"title": "", "outline": []}
+    outline["partial"] = True
+    outline["partial_reason"] = reason
+    outline["pages_processed"] = len(store)
+    return outline
@@ -0,0 +1,159 @@
+"""
+Heading-bounded sections for Round 1B
+
+Instead of treating every page as one "section", a document's spans are cut
+at its headings, using the same heading test as Round 1A
+(process_pdfs.is_heading_span against the document's font statistics).
+Round 1B documents often set headings in bold at body size, which
+determine_heading_level cannot give a level, so a section boundary only
+needs the heading test plus layout:
+
+- the span must sit alone on its line (bold words inside a sentence, e.g.
+  UI labels in instructions, are not headings) and must not end with ":"
+- consecutive heading lines in the same style are one wrapped title
+- a heading directly followed by another heading (e.g. a document title
+  above "Introduction") keeps the following one as part of its body
+
+Sections are returned in the page format used throughout persona_intelligence
+({"page_number", "text", "file"}) plus "section_title", so all scoring and
+ranking code runs on them unchanged.
+"""
+
+import os
+
+try:
+    from .extraction_cache import get_extraction_cache
+    from .metrics import timer, record_document
+    from .pdf_source import PDFSource
+    from .process_pdfs import (
+        load_span_store, font_statistics, count_font_sizes, is_heading_span, SPAN_EXTRACTOR_VERSION
+    )
+except ImportError:
+    from extraction_cache import get_extraction_cache
+    from metrics import timer, record_document
+    from pdf_source import PDFSource
+    from process_pdfs import (
+        load_span_store, font_statistics, count_font_sizes, is_heading_span, SPAN_EXTRACTOR_VERSION
+    )
+
+# Bump when the sections produced for the same spans change
+SECTION_SPLITTER_VERSION = f"{SPAN_EXTRACTOR_VERSION}.2"
+
+def same_line(first, second):
+    """Whether two span bboxes overlap vertically by more than half the smaller height"""
+    overlap = min(first[3], second[3]) - max(first[1], second[1])
+    return overlap > 0.5 * min(first[3] - first[1], second[3] - second[1])
+
+def is_next_line(first, second):
+    """Whether second starts on the line right below first (no paragraph gap)"""
+    gap = second[1] - first[3]
+    height = second[3] - second[1]
+    return -0.5 * height < gap < 0.4 * height
+
+def is_section_heading(spans, bboxes, i, avg_font_size):
+    """Heading test for span i of a page, plus the layout checks described above"""
+    text, size, flags = spans[i]
+    text = text.strip()
+    if len(text) < 3 or len(text) > 200 or text.endswith(":"):
+        return False
+    if not is_heading_span(text, size, flags, avg_font_size):
+        return False
+    if i > 0 and same_line(bboxes[i - 1], bboxes[i]):
+        return False
+    return not (i + 1 < len(spans) and same_line(bboxes[i + 1], bboxes[i]))
+
+def split_sections(store, file_name):
+    """
+    Cut a SpanStore into heading-bounded sections
+    Returns: list of {"page_number" (1-based, where the section starts),
+    "section_title" ("" for text before the first heading), "text", "file"}
+    """
+    stats = font_statistics(count_font_sizes(store.iter_pages()))
+    if stats is None:
+        return []
+    avg_font_size = stats[0]
+
+    sections = []
+    current = None           # section being filled: title parts and text lines
+    previous = None          # (is_heading, size, flags, bbox) of the previous span
+
+    for page_index, (page_num, spans) in enumerate(store.iter_pages()):
+        bboxes = store.page_bboxes(page_index)
+
+        for i, (text, size, flags) in enumerate(spans):
+            heading = is_section_heading(spans, bboxes, i, avg_font_size)
+
+            if heading and current is not None and not current["lines"]:
+                if previous[0] and previous[1:3] == (size, flags) and is_next_line(previous[3], bboxes[i]):
+                    # Next line of a wrapped title
+                    current["title"].append(text.strip())
+                    previous = (True, size, flags, bboxes[i])
+                    continue
+                if current["title"]:
+                    # Heading right below a heading: part of the section body
+                    heading = False
+
+            if heading:
+                current = {"page_number": page_num + 1, "title": [text.strip()], "lines": []}
+                sections.append(current)
+            else:
+                if current is None:
+                    current = {"page_number": page_num + 1, "title": [], "lines": []}
+                    sections.append(current)
+                if current["lines"] and previous is not None and same_line(previous[3], bboxes[i]):
+                    current["lines"][-1] += " " + text  # SpanStore text is stripped
+                else:
+                    current["lines"].append(text)
+
+            previous = (heading, size, flags, bboxes[i])
+
+    return [
+        {
+            "page_number": section["page_number"],
+            "section_title": " ".join(section["title"]),
+            "text": "\n".join(section["lines"]).strip(),
+            "file": file_name
+        }
+        for section in sections
+    ]
+
+def extract_sections_from_pdf(pdf_path):
+    """
+    Heading-bounded sections of a PDF (see split_sections), cached per document
+    The file is mapped once (see pdf_source) for the cache digest and, on a
+    miss, the span extraction
+    Returns: list of sections in the format of extract_text_from_pdf pages
+    """
+    file_name = os.path.basename(str(pdf_path))
+
+    try:
+        source = PDFSource(pdf_path)
+    except OSError as e:
+        print(f"Error loading PDF {pdf_path}: {e}")
+        return []
+
+    with source:
+        cache = get_extraction_cache()
+        cache_key = None
+        if cache is not None:
+            try:
+                cache_key = cache.key_for(pdf_path, "sections", SECTION_SPLITTER_VERSION, digest=source.digest())
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    return [dict(section, file=file_name) for section in cached]
+            except OSError as e:
+                print(f"Cache lookup failed for {pdf_path}: {e}")
+
+        store = load_span_store(str(pdf_path), source=source)
+
+    record_document(pdf_path, len(store), store.span_count)
+    with timer("headings", pdf_path):
+        sections = split_sections(store, file_name)
+
+    if cache_key is not None:
+        # Cache entries are content-addressed, so the file name is not stored
+        cache.put(cache_key, [
+            {key: value for key, value in section.items() if key != "file"} for section in sections
+        ])
+
+    return sections
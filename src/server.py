@@ -0,0 +1,280 @@
+"""
+Long-running service mode: PDFs in, JSON out, over local HTTP or a Unix socket
+
+Started with `python main.py --serve 127.0.0.1:8080` (or `--serve unix:/run/pdf.sock`).
+Interpreter start, the PyMuPDF and NumPy imports and the worker processes are paid
+once; every request is handed to an already running process pool, so latency
+for a small PDF is the parse itself.
+
+Endpoints (all responses are JSON):
+
+    GET  /health    {"status": "ok", "workers": N}
+    POST /outline   process_pdf_to_outline of one PDF
+    POST /title     process_pdf_to_title of one PDF
+    POST /persona   analyze_persona_intelligence output for a set of PDFs
+
+/outline and /title take either a JSON body {"path": "/abs/file.pdf"} or the
+PDF bytes themselves with Content-Type: application/pdf. Bookmarks can be
+turned off with "use_bookmarks": false in the JSON body, or with the query
+string ?use_bookmarks=false. /persona takes {"input_dir": "..."} or
+{"paths": [...]}, plus optional "ranking", "top_k" and "segmentation" as on
+the command line.
+
+Errors are returned as {"error": message} with a 4xx/5xx status. When a
+worker dies, the pool is replaced and the requests it failed are rerun one per
+fresh process, so only the request that crashes its own process fails.
+"""
+
+import os
+import json
+import shutil
+import signal
+import tempfile
+import threading
+import socketserver
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    from .extraction_cache import configure_pool_worker, pool_worker_args, run_in_worker_process
+    from .process_pdfs import process_pdf_to_outline, process_pdf_to_title
+    from .persona_intelligence import analyze_persona_intelligence
+except ImportError:
+    from extraction_cache import configure_pool_worker, pool_worker_args, run_in_worker_process
+    from process_pdfs import process_pdf_to_outline, process_pdf_to_title
+    from persona_intelligence import analyze_persona_intelligence
+
+DEFAULT_ADDRESS = "127.0.0.1:8080"
+MAX_BODY_BYTES = 256 * 1024 * 1024  # largest accepted request body (uploaded PDF)
+PERSONA_OUTPUT_FILE = "persona_intelligence_output.json"
+
+class RequestError(Exception):
+    """A request that cannot be served; the message is returned with the HTTP status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def persona_job(input_dir, pdf_files, ranking, top_k, segmentation):
+    """
+    Worker side of /persona: run analyze_persona_intelligence into a scratch directory
+    Returns: the output data, or None if there was nothing to analyze
+    """
+    output_dir = tempfile.mkdtemp(prefix="persona-")
+    try:
+        if not analyze_persona_intelligence(input_dir, output_dir, ranking=ranking, top_k=top_k,
+                                            segmentation=segmentation, pdf_files=pdf_files):
+            return None
+        with open(Path(output_dir) / PERSONA_OUTPUT_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+def is_true(value):
+    """Boolean request option from JSON (true/false) or a query string ("1", "true", ...)"""
+    if isinstance(value, str):
+        return value.lower() not in ("0", "false", "no", "off", "")
+    return bool(value)
+
+class PipelineService:
+    """A warm process pool running the Round 1A/1B entry points for the request handlers"""
+
+    def __init__(self, workers=1):
+        self.workers = max(1, workers)
+        self._lock = threading.Lock()
+        self._pool = self._start_pool()
+
+    def _start_pool(self):
+        # Workers share the server's extraction cache and metrics file, if any
+        pool = ProcessPoolExecutor(max_workers=self.workers, initializer=configure_pool_worker,
+                                   initargs=pool_worker_args())
+        # Start every worker now rather than on the first requests
+        for future in [pool.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+        return pool
+
+    def run(self, fn, *args):
+        """Run fn(*args) on the pool and return its result"""
+        pool = self._pool
+        try:
+            return pool.submit(fn, *args).result()
+        except BrokenProcessPool:
+            with self._lock:
+                if self._pool is pool:
+                    print("⚠️  Worker process died, restarting the pool")
+                    self._pool = self._start_pool()
+
+        # A dead worker fails every request on the pool: rerun this one alone,
+        # so only the request that crashes its process gets an error
+        try:
+            return run_in_worker_process(fn, *args)
+        except BrokenProcessPool:
+            raise RequestError(500, "worker process died while processing the request")
+
+    def run_on_pdf(self, fn, request, *args):
+        """Run fn(pdf path, *args) for a /outline or /title request (a path or uploaded bytes)"""
+        if request.get("pdf_bytes") is not None:
+            fd, pdf_path = tempfile.mkstemp(suffix=".pdf")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(request["pdf_bytes"])
+                return self.run(fn, pdf_path, *args)
+            finally:
+                os.unlink(pdf_path)
+
+        pdf_path = request.get("path")
+        if not isinstance(pdf_path, str):
+            raise RequestError(400, 'expected {"path": ...} or a body with Content-Type: application/pdf')
+        if not os.path.isfile(pdf_path):
+            raise RequestError(404, f"PDF not found: {pdf_path}")
+        return self.run(fn, pdf_path, *args)
+
+    def outline(self, request):
+        return self.run_on_pdf(process_pdf_to_outline, request, False, 1,
+                               is_true(request.get("use_bookmarks", True)))
+
+    def title(self, request):
+        return self.run_on_pdf(process_pdf_to_title, request)
+
+    def persona(self, request):
+        if request.get("paths") is not None:
+            pdf_files = [Path(path) for path in request["paths"]]
+            missing = [str(path) for path in pdf_files if not path.is_file()]
+            if missing:
+                raise RequestError(404, f"PDFs not found: {', '.join(missing)}")
+            input_dir = str(pdf_files[0].parent) if pdf_files else "."
+        elif request.get("input_dir") is not None:
+            input_dir = request["input_dir"]
+            if not os.path.isdir(input_dir):
+                raise RequestError(404, f"Input directory not found: {input_dir}")
+            pdf_files = None
+        else:
+            raise RequestError(400, 'expected {"input_dir": ...} or {"paths": [...]}')
+
+        ranking = request.get("ranking", "keyword")
+        segmentation = request.get("segmentation", "page")
+        top_k = request.get("top_k")
+        if ranking not in ("keyword", "bm25") or segmentation not in ("page", "heading"):
+            raise RequestError(400, "ranking must be keyword or bm25, segmentation page or heading")
+        if top_k is not None and (not isinstance(top_k, int) or top_k < 1):
+            raise RequestError(400, "top_k must be a positive integer")
+
+        output = self.run(persona_job, input_dir, pdf_files, ranking, top_k, segmentation)
+        if output is None:
+            raise RequestError(422, "no PDF files to analyze")
+        return output
+
+    def close(self):
+        self._pool.shutdown()
+
+class PipelineRequestHandler(BaseHTTPRequestHandler):
+    """Routes requests to the server's PipelineService"""
+
+    server_version = "PDFPipeline/1.0"
+    routes = {"/outline": "outline", "/title": "title", "/persona": "persona"}
+
+    def do_GET(self):
+        if urlparse(self.path).path == "/health":
+            self.send_json(200, {"status": "ok", "workers": self.server.service.workers})
+        else:
+            self.send_json(404, {"error": f"unknown endpoint: {self.path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        route = self.routes.get(url.path)
+        if route is None:
+            self.send_json(404, {"error": f"unknown endpoint: {url.path}"})
+            return
+
+        try:
+            request = self.read_request(url)
+            result = getattr(self.server.service, route)(request)
+            self.send_json(200, result)
+        except RequestError as e:
+            self.send_json(e.status, {"error": str(e)})
+        except Exception as e:
+            print(f"❌ Error serving {url.path}: {e}")
+            self.send_json(500, {"error": str(e)})
+
+    def read_request(self, url):
+        """Query string options merged with the JSON body; an uploaded PDF goes to pdf_bytes"""
+        request = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            raise RequestError(413, f"request body larger than {MAX_BODY_BYTES} bytes")
+        body = self.rfile.read(length)
+
+        if self.headers.get_content_type() == "application/pdf":
+            request["pdf_bytes"] = body
+        elif body:
+            try:
+                data = json.loads(body)
+            except ValueError:
+                raise RequestError(400, "request body is not valid JSON")
+            if not isinstance(data, dict):
+                raise RequestError(400, "request body must be a JSON object")
+            request.update(data)
+        return request
+
+    def send_json(self, status, data):
+        payload = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP over a Unix domain socket, one thread per connection"""
+
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ("unix", 0)  # handlers log client_address[0]
+
+def make_server(address, service):
+    """
+    HTTP server for address ("host:port" or "unix:/path/to.sock") bound to service
+    Port 0 picks a free port (see server.server_address)
+    """
+    if address.startswith("unix:"):
+        socket_path = address[len("unix:"):]
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)  # left behind by a previous run
+        server = UnixHTTPServer(socket_path, PipelineRequestHandler)
+    else:
+        host, _, port = address.rpartition(":")
+        server = ThreadingHTTPServer((host or "127.0.0.1", int(port)), PipelineRequestHandler)
+    server.service = service
+    return server
+
+def stop_on_sigterm(signum, frame):
+    """SIGTERM (e.g. docker stop) shuts the service down like Ctrl+C"""
+    raise KeyboardInterrupt
+
+def serve(address=None, workers=1):
+    """Run the service on address (default DEFAULT_ADDRESS) until interrupted (Ctrl+C or SIGTERM)"""
+    address = address or DEFAULT_ADDRESS
+    signal.signal(signal.SIGTERM, stop_on_sigterm)
+    service = PipelineService(workers)
+    server = make_server(address, service)
+    print(f"🛰️  Serving on {address} with {service.workers} warm worker processes")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Shutting down")
+    finally:
+        server.server_close()
+        service.close()
+        if address.startswith("unix:"):
+            try:
+                os.unlink(address[len("unix:"):])
+            except OSError:
+                pass
+    return True
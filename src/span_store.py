@@ -0,0 +1,164 @@
+"""
+Columnar storage for the text spans of a PDF
+
+Instead of one dict (plus a bbox list) per span, a SpanStore keeps parallel
+typed arrays for sizes, flags, interned font ids and bboxes, and all span
+text in a single string addressed by offsets. A document with millions of
+spans therefore costs a handful of Python objects instead of millions.
+"""
+
+from array import array
+
+class SpanStore:
+    """Page-ordered spans of one document held in parallel arrays"""
+
+    def __init__(self):
+        self.fonts = []             # interned font names, indexed by font id
+        self._font_ids = {}
+        self.font_ids = array('I')
+        self.sizes = array('d')
+        self.flags = array('i')
+        self.bboxes = array('d')    # x0, y0, x1, y1 per span
+        self.text_offsets = array('q', [0])
+        self.page_nums = array('i')
+        self.page_offsets = array('q', [0])  # first span index of each page
+        self._text = ""
+        self._page_text = []        # joined text of finished pages not yet merged
+        self._pending_text = []     # span text of the page being built
+
+    def __len__(self):
+        """Number of pages"""
+        return len(self.page_nums)
+
+    @property
+    def span_count(self):
+        return len(self.sizes)
+
+    @property
+    def text(self):
+        """All span text concatenated; span i is text[text_offsets[i]:text_offsets[i + 1]]"""
+        if self._page_text or self._pending_text:
+            self._text = "".join([self._text, *self._page_text, *self._pending_text])
+            self._page_text = []
+            self._pending_text = []
+        return self._text
+
+    def _intern_font(self, font):
+        font_id = self._font_ids.get(font)
+        if font_id is None:
+            font_id = self._font_ids[font] = len(self.fonts)
+            self.fonts.append(font)
+        return font_id
+
+    def add_span(self, text, font, size, flags, bbox):
+        """Append a span (stripped text) to the page currently being built"""
+        self.font_ids.append(self._intern_font(font))
+        self.sizes.append(size)
+        self.flags.append(flags)
+        self.bboxes.extend(bbox)
+        self._pending_text.append(text)
+        self.text_offsets.append(self.text_offsets[-1] + len(text))
+
+    def end_page(self, page_num):
+        """Close the current page; spans added since the last call belong to it"""
+        self.page_nums.append(page_num)
+        self.page_offsets.append(len(self.sizes))
+        self._page_text.append("".join(self._pending_text))
+        self._pending_text = []
+
+    def extend(self, other):
+        """Append all pages of another store (e.g. a chunk extracted by a worker)"""
+        font_map = [self._intern_font(font) for font in other.fonts]
+        span_base = len(self.sizes)
+        text_base = self.text_offsets[-1]
+
+        self.font_ids.extend(array('I', (font_map[font_id] for font_id in other.font_ids)))
+        self.sizes.extend(other.sizes)
+        self.flags.extend(other.flags)
+        self.bboxes.extend(other.bboxes)
+        self.text_offsets.extend(array('q', (text_base + offset for offset in other.text_offsets[1:])))
+        self.page_nums.extend(other.page_nums)
+        self.page_offsets.extend(array('q', (span_base + offset for offset in other.page_offsets[1:])))
+        self._page_text.append(other.text)
+
+    def page_spans(self, page_index):
+        """(text, size, flags) for every span of the page at page_index"""
+        text = self.text
+        offsets = self.text_offsets
+        start, end = self.page_offsets[page_index], self.page_offsets[page_index + 1]
+        return [
+            (text[offsets[i]:offsets[i + 1]], self.sizes[i], self.flags[i])
+            for i in range(start, end)
+        ]
+
+    def page_bboxes(self, page_index):
+        """(x0, y0, x1, y1) for every span of the page at page_index"""
+        bboxes = self.bboxes
+        start, end = self.page_offsets[page_index], self.page_offsets[page_index + 1]
+        return [tuple(bboxes[4 * i:4 * i + 4]) for i in range(start, end)]
+
+    def iter_pages(self):
+        """Yield (page_num, spans) for every page, see page_spans"""
+        for page_index, page_num in enumerate(self.page_nums):
+            yield page_num, self.page_spans(page_index)
+
+    def to_pages(self):
+        """Legacy view: the list of {"page_num", "blocks"} dicts load_pdf returns"""
+        text = self.text
+        offsets = self.text_offsets
+        pages = []
+        for page_index, page_num in enumerate(self.page_nums):
+            blocks = []
+            for i in range(self.page_offsets[page_index], self.page_offsets[page_index + 1]):
+                blocks.append({
+                    "text": text[offsets[i]:offsets[i + 1]],
+                    "font": self.fonts[self.font_ids[i]],
+                    "size": self.sizes[i],
+                    "flags": self.flags[i],
+                    "bbox": list(self.bboxes[4 * i:4 * i + 4])
+                })
+            pages.append({
+                "page_num": page_num,
+                "blocks": blocks
+            })
+        return pages
+
+    @classmethod
+    def from_pages(cls, pages):
+        """Build a store from the legacy list-of-dicts representation"""
+        store = cls()
+        for page in pages:
+            for block in page["blocks"]:
+                store.add_span(block["text"], block["font"], block["size"], block["flags"], block["bbox"])
+            store.end_page(page["page_num"])
+        return store
+
+    def to_dict(self):
+        """JSON-serialisable form (used by the extraction cache)"""
+        return {
+            "fonts": self.fonts,
+            "font_ids": self.font_ids.tolist(),
+            "sizes": self.sizes.tolist(),
+            "flags": self.flags.tolist(),
+            "bboxes": self.bboxes.tolist(),
+            "text": self.text,
+            "text_offsets": self.text_offsets.tolist(),
+            "page_nums": self.page_nums.tolist(),
+            "page_offsets": self.page_offsets.tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Inverse of to_dict"""
+        store = cls()
+        store.fonts = data["fonts"]
+        store._font_ids = {font: font_id for font_id, font in enumerate(store.fonts)}
+        store.font_ids = array('I', data["font_ids"])
+        store.sizes = array('d', data["sizes"])
+        store.flags = array('i', data["flags"])
+        store.bboxes = array('d', data["bboxes"])
+        store._text = data["text"]
+        store.text_offsets = array('q', data["text_offsets"])
+        store.page_nums = array('i', data["page_nums"])
+        store.page_offsets = array('q', data["page_offsets"])
+        return store
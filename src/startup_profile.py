@@ -0,0 +1,86 @@
+"""
+Import-time profile of main.py startup, for --profile-startup
+
+The statements are run in a fresh interpreter under `python -X importtime`,
+with a marker line written to stderr before each one, so the report can be
+split into the imports each statement triggered:
+
+- `import main`: what every job pays before any work starts; checked against
+  STARTUP_BUDGET_MS (by --profile-startup and by the test suite)
+- the modules of the round that runs (main.ROUND_MODULES), imported on first use
+"""
+
+import sys
+import subprocess
+from collections import namedtuple
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Budget for `import main` alone (light modules only, see main.py)
+STARTUP_BUDGET_MS = 150
+
+# Never imported by `import main`: only the round that runs may load them
+HEAVY_MODULES = ["fitz", "pymupdf", "PyPDF2", "numpy"]
+
+MARKER = "--startup-profile--"
+
+# One line of the -X importtime report; depth 0 is a module the statement imported directly
+ImportTiming = namedtuple("ImportTiming", ["module", "self_ms", "cumulative_ms", "depth"])
+
+def parse_importtime(lines):
+    """ImportTiming per `import time: self [us] | cumulative | name` report line"""
+    timings = []
+    for line in lines:
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        timings.append(ImportTiming(name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000, depth))
+    return timings
+
+def profile_imports(statements):
+    """
+    Run statements in order in a fresh interpreter (cwd: project root) under -X importtime
+    Returns: list with the ImportTimings of the imports each statement triggered
+    """
+    code = "import sys\n" + "".join(
+        f"sys.stderr.write({MARKER!r} + '\\n'); sys.stderr.flush()\n{statement}\n" for statement in statements
+    )
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=PROJECT_ROOT,
+                            capture_output=True, text=True, check=True)
+
+    sections = result.stderr.split(MARKER + "\n")[1:]
+    return [parse_importtime(section.splitlines()) for section in sections]
+
+def total_ms(timings):
+    """Import time of a statement: the cumulative time of its top-level imports"""
+    return sum(timing.cumulative_ms for timing in timings if timing.depth == 0)
+
+def startup_profile(round_modules):
+    """
+    Profile `import main`, then importing round_modules
+    Returns: (main timings, round timings)
+    """
+    main_timings, round_timings = profile_imports(
+        ["import main", "".join(f"import {module}; " for module in round_modules) or "pass"]
+    )
+    return main_timings, round_timings
+
+def print_startup_profile(round_modules, label, top=10):
+    """
+    Print the slowest imports of main.py and of the round's modules
+    Returns: True if `import main` stays within STARTUP_BUDGET_MS
+    """
+    main_timings, round_timings = startup_profile(round_modules)
+
+    for title, timings in (("main.py", main_timings), (label, round_timings)):
+        print(f"⏱️  {title}: {total_ms(timings):.1f} ms in imports")
+        print("   cumulative      self  module")
+        for timing in sorted(timings, key=lambda t: -t.cumulative_ms)[:top]:
+            print(f"   {timing.cumulative_ms:7.1f} ms {timing.self_ms:6.1f} ms  {'  ' * timing.depth}{timing.module}")
+
+    main_ms = total_ms(main_timings)
+    within_budget = main_ms <= STARTUP_BUDGET_MS
+    print(f"{'✅' if within_budget else '❌'} main.py startup {main_ms:.1f} ms (budget {STARTUP_BUDGET_MS} ms)")
+    return within_budget
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Tests for batch Round 1B over several collections
+"""
+
+import sys
+import json
+from pathlib import Path
+
+# Add src directory to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from batch import analyze_collections, discover_collections
+from persona_intelligence import analyze_persona_intelligence
+
+COLLECTIONS = PROJECT_ROOT / "Dataset" / "Challenge_1b"
+
+def load_output(output_dir):
+    with open(Path(output_dir) / "persona_intelligence_output.json", encoding='utf-8') as f:
+        output = json.load(f)
+    output["metadata"].pop("timestamp")
+    return output
+
+def test_batch_keyword_outputs_match_single_collection_runs(tmp_path):
+    """With keyword ranking the shared index gives every collection its standalone output"""
+    assert [collection.name for collection in discover_collections(COLLECTIONS)] == [
+        "Collection 1", "Collection 2", "Collection 3"
+    ]
+    assert analyze_collections(COLLECTIONS, tmp_path / "batch", workers=2)
+
+    for name in ["Collection 1", "Collection 3"]:
+        analyze_persona_intelligence(COLLECTIONS / name / "PDFs", tmp_path / name)
+        assert load_output(tmp_path / "batch" / name) == load_output(tmp_path / name)
+
+def test_collection_spec_sets_persona_and_job(tmp_path):
+    """A challenge1b_input.json role and task override detection and the generated job"""
+    collection = tmp_path / "root" / "Collection 7"
+    (collection / "PDFs").mkdir(parents=True)
+    for pdf_file in sorted((COLLECTIONS / "Collection 1" / "PDFs").glob("*.pdf"))[:2]:
+        (collection / "PDFs" / pdf_file.name).symlink_to(pdf_file)
+    (collection / "challenge1b_input.json").write_text(json.dumps({
+        "persona": {"role": "Home Cook"},
+        "job_to_be_done": {"task": "Find regional dishes to cook"}
+    }))
+
+    assert analyze_collections(tmp_path / "root", tmp_path / "out")
+    metadata = load_output(tmp_path / "out" / "Collection 7")["metadata"]
+    assert metadata["persona"] == "Home Cook"
+    assert metadata["job_to_be_done"] == "Find regional dishes to cook"
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests for duplicate page detection in Round 1B
+"""
+
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import dedup
+from dedup import find_duplicate_pages, simhash, page_tokens
+from persona_intelligence import extract_sections_and_analyze
+
+GUIDE = (
+    "Nice travel guide to the coast of southern France. The best beaches are a short walk from the old town, "
+    "where narrow streets lead to the harbour and the morning market. Book a hotel near the promenade in summer, "
+    "or stay in a small guest house in the hills for quieter evenings. Local restaurants serve fresh seafood, "
+    "socca and salade nicoise; reserve a table for dinner on weekends. Regional trains connect every town along "
+    "the coast, and buses climb to the perched villages of the hinterland. Museums open at ten and close on "
+    "Tuesdays. Hiking trails start from the station and follow the cliffs to hidden coves, so bring water, a hat "
+    "and comfortable shoes."
+)
+
+def page(file, page_number, text):
+    return {"file": file, "page_number": page_number, "text": text}
+
+def test_exact_and_near_duplicates_point_at_first_page():
+    """Reformatted copies and one-word edits map to the first page; distinct pages do not"""
+    documents_text = [
+        [page("a.pdf", 1, GUIDE), page("a.pdf", 2, "Legal notice. All rights reserved.")],
+        [page("b.pdf", 1, GUIDE.upper().replace(" ", "\n")),
+         page("b.pdf", 2, GUIDE.replace("a hat", "a cap")),
+         page("b.pdf", 3, "Legal notice. All rights reserved."),
+         page("b.pdf", 4, "Packing list: passport, tickets, adapters, sunscreen and comfortable shoes " * 3)]
+    ]
+
+    assert find_duplicate_pages(documents_text) == {(1, 0): (0, 0), (1, 1): (0, 0), (1, 2): (0, 1)}
+
+def test_simhash_without_numpy_matches(monkeypatch):
+    """The pure-Python bit votes give the same fingerprint as the numpy path"""
+    tokens = page_tokens(GUIDE)
+    fingerprint = simhash(tokens)
+    monkeypatch.setattr(dedup, "np", None)
+    assert simhash(tokens) == fingerprint
+
+def test_duplicates_collapse_into_one_section():
+    """With dedupe a repeated page is ranked once and lists the copies it stands for"""
+    documents_text = [[page("a.pdf", 1, GUIDE)], [page("b.pdf", 3, GUIDE)]]
+
+    sections, subsections = extract_sections_and_analyze(documents_text, "travel_planner")
+    assert len(sections) == 2
+
+    sections, subsections = extract_sections_and_analyze(documents_text, "travel_planner", dedupe=True)
+    assert len(sections) == len(subsections) == 1
+    assert sections[0]["duplicate_pages"] == [{"document": "b.pdf", "page_number": 3}]
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the content-addressed extraction cache
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pdf_source
+import extraction_cache
+from extraction_cache import ExtractionCache, configure_extraction_cache
+from process_pdfs import process_pdf_to_outline
+from sections import extract_sections_from_pdf
+
+PDF_DIR = Path(__file__).parent.parent / "Dataset" / "Challenge _1(a)" / "Datasets" / "Pdfs"
+
+def test_cache_is_content_addressed(tmp_path):
+    """Identical bytes under different names share an entry"""
+    cache = ExtractionCache(tmp_path / "cache")
+    first = tmp_path / "a.pdf"
+    second = tmp_path / "b.pdf"
+    first.write_bytes(b"%PDF-1.4 same bytes")
+    second.write_bytes(b"%PDF-1.4 same bytes")
+
+    cache.put(cache.key_for(first, "spans", 1), [{"page_num": 0, "blocks": []}])
+
+    assert cache.get(cache.key_for(second, "spans", 1)) == [{"page_num": 0, "blocks": []}]
+    assert cache.get(cache.key_for(second, "spans", 2)) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Entries untouched for longest are evicted once the size limit is hit"""
+    cache = ExtractionCache(tmp_path / "cache", max_bytes=250)
+    payload = "x" * 80
+
+    for index, key in enumerate(["old", "used", "new"]):
+        cache.put(key, payload)
+        entry = tmp_path / "cache" / f"{key}.json"
+        os.utime(entry, (time.time() - 100 + index, time.time() - 100 + index))
+
+    cache.get("old")  # refresh "old" so "used" becomes the oldest entry
+    cache.put("newest", payload)
+
+    assert cache.get("used") is None
+    assert cache.get("old") == payload
+    assert cache.get("newest") == payload
+
+def test_overwriting_a_key_counts_its_size_once(tmp_path):
+    """Rewriting an entry replaces its size in the running total instead of adding to it"""
+    cache = ExtractionCache(tmp_path / "cache", max_bytes=250)
+
+    for _ in range(5):
+        cache.put("same", "x" * 80)
+    cache.put("same", "x" * 40)
+
+    assert cache._total_bytes == (tmp_path / "cache" / "same.json").stat().st_size
+    assert cache.get("same") == "x" * 40
+
+@pytest.fixture
+def pdf_opens(tmp_path, monkeypatch):
+    """Counts of PDFSource mappings and PyMuPDF documents, with the cache enabled and file_digest disabled"""
+    counts = {"sources": 0, "documents": 0}
+    source_init, open_fitz = pdf_source.PDFSource.__init__, pdf_source.PDFSource.open_fitz
+
+    def counting_init(self, filepath):
+        counts["sources"] += 1
+        source_init(self, filepath)
+
+    def counting_open_fitz(self):
+        counts["documents"] += 1
+        return open_fitz(self)
+
+    def no_file_digest(filepath):
+        raise AssertionError(f"{filepath} read again for its digest")
+
+    monkeypatch.setattr(pdf_source.PDFSource, "__init__", counting_init)
+    monkeypatch.setattr(pdf_source.PDFSource, "open_fitz", counting_open_fitz)
+    monkeypatch.setattr(extraction_cache, "file_digest", no_file_digest)
+    configure_extraction_cache(tmp_path / "cache")
+    yield counts
+    configure_extraction_cache(None)
+
+def test_outline_maps_each_pdf_once_and_warm_runs_skip_pymupdf(pdf_opens):
+    """Bookmark probe and span extraction share one PDFSource; a warm cache opens no document"""
+    pdf_files = sorted(PDF_DIR.glob("*.pdf"))
+    cold = [process_pdf_to_outline(str(pdf_file)) for pdf_file in pdf_files]
+    assert pdf_opens == {"sources": len(pdf_files), "documents": len(pdf_files)}
+
+    pdf_opens.update(sources=0, documents=0)
+    assert [process_pdf_to_outline(str(pdf_file)) for pdf_file in pdf_files] == cold
+    assert pdf_opens == {"sources": len(pdf_files), "documents": 0}
+
+def test_heading_sections_map_each_pdf_once(pdf_opens):
+    """The sections cache key uses the digest of the mapping that span extraction reuses"""
+    pdf_file = PDF_DIR.parent.parent.parent / "Challenge_1b" / "Collection 1" / "PDFs" / "South of France - Cuisine.pdf"
+    cold = extract_sections_from_pdf(pdf_file)
+    assert pdf_opens == {"sources": 1, "documents": 1}
+
+    assert extract_sections_from_pdf(pdf_file) == cold
+    assert pdf_opens == {"sources": 2, "documents": 1}
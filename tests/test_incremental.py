@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental watch mode
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+from pathlib import Path
+
+# Add src directory to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+import incremental
+import persona_intelligence
+from process_pdfs import process_pdf_to_outline
+
+ROUND_1A_PDFS = PROJECT_ROOT / "Dataset" / "Challenge _1(a)" / "Datasets" / "Pdfs"
+COLLECTION_PDFS = PROJECT_ROOT / "Dataset" / "Challenge_1b" / "Collection 1" / "PDFs"
+
+def copy_settled(source_dir, target_dir):
+    """Copy PDFs and back-date them past the settle window"""
+    shutil.copytree(source_dir, target_dir)
+    past = time.time() - 60
+    for pdf_file in Path(target_dir).glob("*.pdf"):
+        os.utime(pdf_file, (past, past))
+
+def test_round1a_watch_processes_only_changes(tmp_path):
+    """Unchanged PDFs are skipped, removed PDFs lose their outline"""
+    input_dir = tmp_path / "input"
+    output_dir = tmp_path / "output"
+    copy_settled(ROUND_1A_PDFS, input_dir)
+
+    incremental.watch_directory(input_dir, output_dir, "round1a", max_cycles=1)
+    outputs = sorted(p.name for p in output_dir.glob("*.json"))
+    assert outputs == sorted(f"{p.stem}.json" for p in input_dir.glob("*.pdf"))
+
+    manifest = incremental.WatchManifest(output_dir / incremental.MANIFEST_NAME, "round1a")
+    changed, removed, _ = incremental.scan_input(input_dir, manifest)
+    assert (changed, removed) == ([], [])
+
+    removed_pdf = sorted(input_dir.glob("*.pdf"))[0]
+    removed_pdf.unlink()
+    incremental.watch_directory(input_dir, output_dir, "round1a", max_cycles=1)
+    assert not (output_dir / f"{removed_pdf.stem}.json").exists()
+
+    kept_pdf = sorted(input_dir.glob("*.pdf"))[0]
+    with open(output_dir / f"{kept_pdf.stem}.json", encoding='utf-8') as f:
+        assert json.load(f) == process_pdf_to_outline(str(kept_pdf))
+
+def test_round1a_watch_uses_outline_options(tmp_path):
+    """--title-only and --compact-json apply in watch mode; other options reprocess everything"""
+    input_dir = tmp_path / "input"
+    output_dir = tmp_path / "output"
+    copy_settled(ROUND_1A_PDFS, input_dir)
+    pdf_file = sorted(input_dir.glob("*.pdf"))[0]
+    output_file = output_dir / f"{pdf_file.stem}.json"
+
+    incremental.watch_directory(input_dir, output_dir, "round1a", max_cycles=1,
+                                round1a_options={"title_only": True, "compact_json": True})
+    with open(output_file, encoding='utf-8') as f:
+        assert set(json.load(f)) == {"title"}
+    assert "\n" not in output_file.read_text(encoding='utf-8')
+
+    incremental.watch_directory(input_dir, output_dir, "round1a", max_cycles=1)
+    with open(output_file, encoding='utf-8') as f:
+        assert json.load(f) == process_pdf_to_outline(str(pdf_file))
+
+def test_round1b_watch_matches_batch_analysis(tmp_path):
+    """Rankings rebuilt from cached page scores equal a full batch run"""
+    input_dir = tmp_path / "input"
+    copy_settled(COLLECTION_PDFS, input_dir)
+
+    incremental.watch_directory(input_dir, tmp_path / "watch", "round1b", max_cycles=1)
+    persona_intelligence.analyze_persona_intelligence(input_dir, tmp_path / "batch")
+
+    results = []
+    for output_dir in ("watch", "batch"):
+        with open(tmp_path / output_dir / "persona_intelligence_output.json", encoding='utf-8') as f:
+            result = json.load(f)
+        result["metadata"].pop("timestamp")
+        results.append(result)
+
+    assert results[0] == results[1]
+
+def test_round1b_watch_rebuilds_when_top_k_changes(tmp_path):
+    """Restarting with a different --top-k reranks even though no PDF changed"""
+    input_dir = tmp_path / "input"
+    output_file = tmp_path / "output" / "persona_intelligence_output.json"
+    copy_settled(COLLECTION_PDFS, input_dir)
+
+    section_counts = []
+    for top_k in (None, 2, 2):
+        incremental.watch_directory(input_dir, tmp_path / "output", "round1b", max_cycles=1, top_k=top_k)
+        with open(output_file, encoding='utf-8') as f:
+            section_counts.append(len(json.load(f)["extracted_sections"]))
+
+    assert section_counts[0] > 2
+    assert section_counts[1:] == [2, 2]
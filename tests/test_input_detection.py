@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Tests for input directory listing and round detection
+"""
+
+import sys
+from pathlib import Path
+
+# main.py lives in the project root
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import main
+
+def test_scan_matches_glob(tmp_path):
+    """The single scandir pass finds the same PDFs, in the same order, as Path.glob"""
+    for name in ["b.pdf", "a.pdf", "notes.txt", "scan.PDF", ".hidden.pdf"]:
+        (tmp_path / name).write_bytes(b"")
+    (tmp_path / "folder.pdf").mkdir()
+
+    listing = main.scan_input_dir(tmp_path)
+    assert listing.pdf_files == list(tmp_path.glob("*.pdf"))
+    assert sorted(listing.names) == sorted(path.name for path in tmp_path.glob("*"))
+
+def test_detection_uses_file_and_directory_names(tmp_path, monkeypatch):
+    """Persona files or collection names select Round 1B; plain PDFs Round 1A"""
+    monkeypatch.setattr(main, "has_persona_json", lambda: False)
+    (tmp_path / "report.pdf").write_bytes(b"")
+    assert main.detect_input_type(tmp_path) == "round1a"
+
+    (tmp_path / "my_persona.json").write_text("{}")
+    assert main.detect_input_type(tmp_path, main.scan_input_dir(tmp_path)) == "round1b"
+
+    collection = tmp_path / "South of France - Guides"
+    collection.mkdir()
+    assert main.detect_input_type(collection) == "round1b"
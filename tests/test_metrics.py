@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Tests for the pipeline metrics
+"""
+
+import sys
+import json
+from pathlib import Path
+
+# Add src directory to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+import metrics
+from process_pdfs import process_pdf_to_outline
+
+PDF_FILE = PROJECT_ROOT / "Dataset" / "Challenge _1(a)" / "Datasets" / "Pdfs" / "E0H1CM114.pdf"
+
+def test_disabled_metrics_are_no_ops():
+    """Without a metrics file, timers are the shared no-op and events are dropped"""
+    metrics.configure_metrics(None)
+    assert metrics.timer("open", "a.pdf") is metrics.NULL_TIMER
+    metrics.record("cache", kind="spans", hit=True)
+
+def test_outline_extraction_is_timed_and_counted(tmp_path):
+    """Stage timers and page/span counts end up in the file, summary and Prometheus dump"""
+    metrics_file = tmp_path / "metrics.jsonl"
+    metrics.configure_metrics(metrics_file)
+    try:
+        process_pdf_to_outline(str(PDF_FILE), use_bookmarks=False)
+    finally:
+        metrics.configure_metrics(None)
+
+    with open(metrics_file, encoding='utf-8') as f:
+        events = [json.loads(line) for line in f]
+    assert {event["stage"] for event in events if event["event"] == "timer"} == {"open", "extract", "headings"}
+
+    summary = metrics.summarize_metrics(metrics_file)
+    assert summary["documents"] == 1
+    assert summary["pages"] > 0 and summary["spans"] > 0
+    assert summary["slowest"][0][0] == str(PDF_FILE)
+
+    metrics.write_prometheus(metrics_file, tmp_path / "metrics.prom")
+    text = (tmp_path / "metrics.prom").read_text(encoding='utf-8')
+    assert 'pdf_pipeline_stage_seconds_count{stage="headings"} 1' in text
+    assert f"pdf_pipeline_pages_total {summary['pages']}" in text
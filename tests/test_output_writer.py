@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the background JSON output writer
+"""
+
+import os
+import sys
+import json
+import stat
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import output_writer
+from output_writer import OutputWriter, encode_json
+
+SAMPLE_OUTLINE = {
+    "title": "Überblick – 2024",
+    "outline": [{"level": "H1", "text": "Introduction", "page": 0}]
+}
+
+def test_writer_writes_all_outputs_atomically(tmp_path):
+    """Every submitted document ends up complete on disk, with no temp files left"""
+    with OutputWriter(max_pending=2) as writer:
+        for i in range(10):
+            writer.submit(tmp_path / f"doc{i}.json", dict(SAMPLE_OUTLINE, page_count=i))
+
+    assert writer.written == 10 and writer.errors == []
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(f"doc{i}.json" for i in range(10))
+    with open(tmp_path / "doc3.json", encoding='utf-8') as f:
+        assert json.load(f) == dict(SAMPLE_OUTLINE, page_count=3)
+
+def test_writer_reports_failed_writes(tmp_path):
+    """A failing write is reported and does not stop later writes"""
+    with OutputWriter() as writer:
+        writer.submit(tmp_path / "missing" / "doc.json", SAMPLE_OUTLINE)
+        writer.submit(tmp_path / "doc.json", SAMPLE_OUTLINE)
+
+    assert [path for path, _ in writer.errors] == [tmp_path / "missing" / "doc.json"]
+    assert (tmp_path / "doc.json").exists()
+    assert list((tmp_path).glob("*.tmp")) == []
+
+def test_encoders_agree():
+    """Default layout matches json.dump(indent=2); compact and fast modes decode to the same data"""
+    assert encode_json(SAMPLE_OUTLINE) == json.dumps(SAMPLE_OUTLINE, indent=2, ensure_ascii=False).encode('utf-8')
+    assert b"\n" not in encode_json(SAMPLE_OUTLINE, compact=True)
+
+    for compact in (False, True):
+        assert json.loads(encode_json(SAMPLE_OUTLINE, compact, fast=True)) == SAMPLE_OUTLINE
+    if output_writer.orjson is not None:
+        assert encode_json(SAMPLE_OUTLINE, fast=True) == encode_json(SAMPLE_OUTLINE)
+
+def test_outputs_get_the_umask_mode_not_mkstemp_0600(tmp_path):
+    """Written files are readable like open() creates them, e.g. 0644 under umask 022"""
+    output_writer.write_json_atomic(tmp_path / "doc.json", SAMPLE_OUTLINE)
+    (tmp_path / "plain.json").write_text("{}")
+
+    mode = stat.S_IMODE(os.stat(tmp_path / "doc.json").st_mode)
+    assert mode == stat.S_IMODE(os.stat(tmp_path / "plain.json").st_mode)
+    assert mode == output_writer.OUTPUT_FILE_MODE
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for multi-document runs: Round 1A with --workers, and --force-round both
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# main.py lives in the project root
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import main
+import src.document_model
+import src.process_pdfs
+
+PDF_DIR = PROJECT_ROOT / "Dataset" / "Challenge _1(a)" / "Datasets" / "Pdfs"
+CRASHING_PDF = "E0CCG5S312.pdf"
+
+process_pdf_to_outline = src.process_pdfs.process_pdf_to_outline
+
+def crash_on_one_pdf(pdf_path, *args):
+    """process_pdf_to_outline whose worker process dies on CRASHING_PDF"""
+    if os.path.basename(pdf_path) == CRASHING_PDF:
+        os._exit(1)
+    return process_pdf_to_outline(pdf_path, *args)
+
+def output_bytes(output_dir):
+    return {path.name: path.read_bytes() for path in sorted(Path(output_dir).glob("*.json"))}
+
+def test_parallel_outputs_are_byte_identical_to_serial(tmp_path):
+    """--workers only changes how documents are scheduled, not what is written"""
+    assert main.run_round1a(PDF_DIR, tmp_path / "serial")
+    assert main.run_round1a(PDF_DIR, tmp_path / "parallel", workers=3)
+
+    serial = output_bytes(tmp_path / "serial")
+    assert len(serial) == len(list(PDF_DIR.glob("*.pdf")))
+    assert output_bytes(tmp_path / "parallel") == serial
+
+def test_crashed_worker_only_loses_its_own_document(tmp_path, monkeypatch):
+    """Documents failed by the broken pool are rerun; only the crashing one has no output"""
+    assert main.run_round1a(PDF_DIR, tmp_path / "serial")
+    monkeypatch.setattr(src.process_pdfs, "process_pdf_to_outline", crash_on_one_pdf)
+    main.run_round1a(PDF_DIR, tmp_path / "parallel", workers=2)
+
+    expected = output_bytes(tmp_path / "serial")
+    del expected[CRASHING_PDF.replace(".pdf", ".json")]
+    assert output_bytes(tmp_path / "parallel") == expected
+
+def test_both_rounds_skip_a_document_that_fails_to_parse(tmp_path, monkeypatch):
+    """An unexpected parse error is logged for that PDF; the others still get both rounds"""
+    parse_document = src.document_model.parse_document
+
+    def fail_on_one_pdf(filepath):
+        if os.path.basename(filepath) == CRASHING_PDF:
+            raise RuntimeError("unexpected parse error")
+        return parse_document(filepath)
+
+    monkeypatch.setattr(src.document_model, "parse_document", fail_on_one_pdf)
+    assert main.run_both_rounds(PDF_DIR, tmp_path)
+
+    outlines = {path.name for path in tmp_path.glob("*.json")} - {"persona_intelligence_output.json"}
+    assert outlines == {f"{path.stem}.json" for path in PDF_DIR.glob("*.pdf") if path.name != CRASHING_PDF}
+    assert (tmp_path / "persona_intelligence_output.json").exists()
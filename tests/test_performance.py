@@ -23,6 +23,43 @@ def setup_test_environment():
     
     return project_root
 
+def load_benchmark_harness():
+    """Import scripts/benchmark.py (per-stage benchmark over the sample datasets)"""
+    project_root = setup_test_environment()
+    scripts_path = project_root / "scripts"
+    if str(scripts_path) not in sys.path:
+        sys.path.insert(0, str(scripts_path))
+    
+    import benchmark
+    return benchmark
+
+def test_benchmark_stages():
+    """
+    Benchmark every sample PDF stage by stage
+    Each document must finish within the 10-second limit. If BENCHMARK_BASELINE
+    points to a report saved with scripts/benchmark.py --save-baseline, no stage
+    may regress by more than BENCHMARK_THRESHOLD percent (default 20).
+    """
+    benchmark = load_benchmark_harness()
+    
+    pdf_files = benchmark.discover_pdfs()
+    assert pdf_files, "No sample PDFs found under Dataset/"
+    
+    report = benchmark.run_benchmark(pdf_files, repeat=1)
+    benchmark.print_report(report)
+    
+    for doc in report["documents"]:
+        doc_time = sum(doc["stages"].values())
+        assert doc_time <= 10, f"{doc['file']} took {doc_time:.2f}s > 10s"
+    
+    baseline_file = os.environ.get("BENCHMARK_BASELINE")
+    if baseline_file:
+        with open(baseline_file, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        threshold = float(os.environ.get("BENCHMARK_THRESHOLD", 20))
+        regressions = benchmark.find_regressions(report, baseline, threshold)
+        assert not regressions, f"Stages regressed past {threshold:.0f}%: {regressions}"
+
 def main():
     """Main performance test function"""
     print("⏱️  Performance Test: PDF Outline Extractor")
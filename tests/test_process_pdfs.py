@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Unit tests for Adobe India Hackathon Round 1A
+Compares the alternative extraction paths against the default pipeline
+"""
+
+import sys
+from pathlib import Path
+
+# Add src directory to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+import process_pdfs
+
+DATASET_PDFS = sorted((PROJECT_ROOT / "Dataset" / "Challenge _1(a)" / "Datasets" / "Pdfs").glob("*.pdf"))
+
+def test_streaming_outline_matches_in_memory():
+    """The bounded-memory streaming path produces the same outline"""
+    assert DATASET_PDFS, "Sample PDFs missing from Dataset/"
+
+    for pdf_file in DATASET_PDFS:
+        expected = process_pdfs.process_pdf_to_outline(str(pdf_file), use_bookmarks=False)
+        streamed = process_pdfs.process_pdf_to_outline(str(pdf_file), streaming=True, use_bookmarks=False)
+        assert streamed == expected, pdf_file.name
+
+def test_parsed_document_serves_round_1a():
+    """A single parse_document pass yields the same outline as the Round 1A loader"""
+    from document_model import parse_document
+
+    for pdf_file in DATASET_PDFS:
+        document = parse_document(str(pdf_file))
+        assert document.outline() == process_pdfs.process_pdf_to_outline(str(pdf_file))
+        assert document.outline(use_bookmarks=False) == process_pdfs.process_pdf_to_outline(str(pdf_file), use_bookmarks=False)
+        assert len(document.page_texts) == len(document.spans)
+
+def test_title_only_matches_full_extraction():
+    """The first-page-only title equals the title of the heuristic path"""
+    for pdf_file in DATASET_PDFS:
+        expected = process_pdfs.process_pdf_to_outline(str(pdf_file), use_bookmarks=False)["title"]
+        assert process_pdfs.process_pdf_to_title(str(pdf_file)) == {"title": expected}, pdf_file.name
+
+def test_vectorized_headings_match_python_path():
+    """The NumPy classifier returns exactly what the per-span loop returns"""
+    if process_pdfs.np is None:
+        return  # NumPy not installed: only the pure Python path is available
+
+    for pdf_file in DATASET_PDFS:
+        store = process_pdfs.load_span_store(str(pdf_file))
+        assert process_pdfs.extract_headings_vectorized(store) == process_pdfs.extract_headings(store.to_pages()), pdf_file.name
+
+def test_bookmarks_are_used_when_valid():
+    """Embedded outlines become H1-H3 entries with 0-based pages; broken ones are rejected"""
+    toc = [[1, "Introduction", 1], [2, "Scope", 1], [3, "Details", 2], [4, "Too deep", 2], [1, "Summary", 3]]
+    assert process_pdfs.outline_from_bookmarks(toc, 3) == [
+        {"level": "H1", "text": "Introduction", "page": 0},
+        {"level": "H2", "text": "Scope", "page": 0},
+        {"level": "H3", "text": "Details", "page": 1},
+        {"level": "H1", "text": "Summary", "page": 2},
+    ]
+    assert process_pdfs.outline_from_bookmarks([], 3) is None
+    assert process_pdfs.outline_from_bookmarks([[1, "Intro", 4]], 3) is None      # page out of range
+    assert process_pdfs.outline_from_bookmarks([[2, "Intro", 1]], 3) is None      # does not start at level 1
+    assert process_pdfs.outline_from_bookmarks([[1, "  ", 1]], 3) is None         # empty title
+
+    toc = [[1, "  Introduction\n", 1], [1, " ", 2], [2, "\tScope ", 2]]
+    assert process_pdfs.outline_from_bookmarks(toc, 3) == [
+        {"level": "H1", "text": "Introduction", "page": 0},
+        {"level": "H2", "text": "Scope", "page": 1},
+    ]
+
+    assert process_pdfs.metadata_title({"title": "TOPJUMP-PARTY-INVITATION-20161003-V01.cdr"}) == ""
+    assert process_pdfs.metadata_title({"title": " Annual Report "}) == "Annual Report"
+
+    flyer = next(pdf_file for pdf_file in DATASET_PDFS if pdf_file.name == "STEMPathwaysFlyer.pdf")
+    outline = process_pdfs.process_pdf_to_outline(str(flyer))
+    assert [entry["text"] for entry in outline["outline"]] == [
+        "Parsippany -Troy Hills STEM Pathways", "PATHWAY OPTIONS", "Elective Course Offerings", "What Colleges Say!"
+    ]
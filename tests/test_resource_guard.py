@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-document extraction budgets
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add src directory to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+import resource_guard
+from resource_guard import extract_pages, guarded_extraction
+from process_pdfs import process_pdf_to_outline
+
+PDF_FILE = PROJECT_ROOT / "Dataset" / "Challenge _1(a)" / "Datasets" / "Pdfs" / "E0H1CM114.pdf"
+
+def test_guarded_outline_matches_unguarded_within_budget():
+    """A document that fits the budget gets exactly the normal outline"""
+    budget = resource_guard.make_budget(document_seconds=60, page_seconds=30)
+    assert resource_guard.process_pdf_guarded(str(PDF_FILE), budget) == process_pdf_to_outline(str(PDF_FILE))
+
+def slow_from_third_page(doc, start, end):
+    """extract_pages that stalls from page 3 on"""
+    if start >= 2:
+        time.sleep(30)
+    return extract_pages(doc, start, end)
+
+def slow_guarded_extraction(*args):
+    """guarded_extraction with a stalling page, run in the child process"""
+    resource_guard.extract_pages = slow_from_third_page
+    return guarded_extraction(*args)
+
+def test_stalled_page_degrades_to_finished_pages(monkeypatch):
+    """A page exceeding its budget ends extraction; the outline uses the pages before it"""
+    # The child is not forked from this process: it imports this module and runs the wrapper
+    monkeypatch.setattr(resource_guard, "guarded_extraction", slow_guarded_extraction)
+
+    started = time.monotonic()
+    outline = resource_guard.process_pdf_guarded(str(PDF_FILE), resource_guard.make_budget(page_seconds=1))
+    assert time.monotonic() - started < 10
+
+    assert outline["partial"] is True
+    assert outline["partial_reason"] == "page_timeout"
+    assert outline["pages_processed"] == 2
+    assert all(heading["page"] < 2 for heading in outline["outline"])
+
+def test_zero_budget_values_are_kept():
+    """Only missing values fall back to DEFAULT_BUDGET"""
+    budget = resource_guard.make_budget(document_seconds=5, memory_mb=0, fallback_pages=0)
+    assert budget == resource_guard.ExtractionBudget(5, resource_guard.DEFAULT_BUDGET.page_seconds, 0, 0)
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for the HTTP service mode
+"""
+
+import sys
+import json
+import threading
+import urllib.request
+import urllib.error
+from pathlib import Path
+
+import pytest
+
+# Add src directory to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from server import PipelineService, make_server
+from process_pdfs import process_pdf_to_outline
+
+PDF_FILE = PROJECT_ROOT / "Dataset" / "Challenge _1(a)" / "Datasets" / "Pdfs" / "E0H1CM114.pdf"
+
+@pytest.fixture(scope="module")
+def base_url():
+    service = PipelineService(workers=1)
+    server = make_server("127.0.0.1:0", service)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+def post(url, body, content_type="application/json"):
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": content_type})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+def test_outline_by_path_and_by_bytes(base_url):
+    """A path and the uploaded bytes of the same PDF give the command-line outline"""
+    expected = process_pdf_to_outline(str(PDF_FILE))
+
+    assert post(f"{base_url}/outline", json.dumps({"path": str(PDF_FILE)}).encode()) == (200, expected)
+    assert post(f"{base_url}/outline", PDF_FILE.read_bytes(), "application/pdf") == (200, expected)
+
+def test_bad_requests_return_json_errors(base_url):
+    """Missing files and malformed bodies are reported with a status and message"""
+    status, body = post(f"{base_url}/outline", json.dumps({"path": "/no/such.pdf"}).encode())
+    assert status == 404 and "not found" in body["error"]
+
+    status, body = post(f"{base_url}/persona", b"not json")
+    assert status == 400 and "error" in body
+
+    with urllib.request.urlopen(f"{base_url}/health") as response:
+        assert json.load(response) == {"status": "ok", "workers": 1}
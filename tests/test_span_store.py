@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the columnar span store used by Round 1A
+"""
+
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import process_pdfs
+from span_store import SpanStore
+
+SAMPLE_PAGES = [
+    {"page_num": 0, "blocks": [
+        {"text": "Annual Report 2024", "font": "Arial-Bold", "size": 24.0, "flags": 16, "bbox": [10.0, 10.0, 300.0, 40.0]},
+        {"text": "Prepared for the board", "font": "Arial", "size": 11.0, "flags": 0, "bbox": [10.0, 50.0, 200.0, 62.0]},
+    ]},
+    {"page_num": 1, "blocks": []},
+    {"page_num": 2, "blocks": [
+        {"text": "1. Introduction", "font": "Arial-Bold", "size": 16.0, "flags": 16, "bbox": [10.0, 10.0, 150.0, 28.0]},
+        {"text": "Body text that is long enough to count – with a dash", "font": "Arial", "size": 11.0, "flags": 0, "bbox": [10.0, 30.0, 400.0, 42.0]},
+        {"text": "SUMMARY OF RESULTS", "font": "Arial", "size": 11.0, "flags": 0, "bbox": [10.0, 50.0, 180.0, 62.0]},
+    ]},
+]
+
+def test_span_store_round_trips_legacy_pages():
+    """The legacy dict view and the serialised form reproduce the input"""
+    store = SpanStore.from_pages(SAMPLE_PAGES)
+
+    assert len(store) == 3
+    assert store.span_count == 5
+    assert store.fonts == ["Arial-Bold", "Arial"]
+    assert store.to_pages() == SAMPLE_PAGES
+    assert SpanStore.from_dict(store.to_dict()).to_pages() == SAMPLE_PAGES
+
+def test_extractors_agree_on_both_representations():
+    """extract_title and extract_headings give the same result for either input"""
+    store = SpanStore.from_pages(SAMPLE_PAGES)
+
+    assert process_pdfs.extract_title(store) == process_pdfs.extract_title(SAMPLE_PAGES)
+    assert process_pdfs.extract_headings(store) == process_pdfs.extract_headings(SAMPLE_PAGES)
+
+def test_extend_merges_chunks_in_page_order():
+    """Stores built per page range merge into the store of the whole document"""
+    whole = SpanStore.from_pages(SAMPLE_PAGES)
+    merged = SpanStore.from_pages(SAMPLE_PAGES[:1])
+    merged.extend(SpanStore.from_pages(SAMPLE_PAGES[1:]))
+
+    assert merged.to_dict() == whole.to_dict()
+
+def test_parallel_page_extraction_matches_serial():
+    """Page-range workers produce the same store as a serial load"""
+    pdf_file = Path(__file__).parent.parent / "Dataset" / "Challenge _1(a)" / "Datasets" / "Pdfs" / "E0H1CM114.pdf"
+    serial = process_pdfs.load_span_store(str(pdf_file))
+    parallel = process_pdfs.load_span_store(str(pdf_file), page_workers=2, min_chunk=1)
+
+    assert parallel.to_dict() == serial.to_dict()
+
+def test_pdf_source_serves_every_reader(tmp_path):
+    """One mapping feeds PyMuPDF, PyPDF2, the cache digest and shared-memory workers"""
+    from extraction_cache import file_digest
+    from pdf_source import PDFSource, open_source
+
+    pdf_file = Path(__file__).parent.parent / "Dataset" / "Challenge _1(a)" / "Datasets" / "Pdfs" / "E0H1CM114.pdf"
+    with PDFSource(pdf_file) as source:
+        assert source.digest() == file_digest(pdf_file)
+        assert len(source.pypdf2_reader().pages) == 14
+
+        with source.share() as shared:
+            from_shared = process_pdfs.extract_page_range(shared, 0, 14)
+            with open_source(shared) as attached:
+                assert bytes(attached.view) == bytes(source.view)
+
+    assert from_shared.to_dict() == process_pdfs.extract_page_range(str(pdf_file), 0, 14).to_dict()
+
+    empty = tmp_path / "empty.pdf"
+    empty.write_bytes(b"")
+    assert len(process_pdfs.load_span_store(str(empty))) == 0
+
+def test_pdf_source_copies_the_buffer_for_old_pymupdf(monkeypatch):
+    """PyMuPDF versions that reject a memoryview stream are given the bytes instead"""
+    import pdf_source
+
+    opened = []
+    fitz_open = pdf_source.fitz.open
+    monkeypatch.setattr(pdf_source, "FITZ_STREAM_TAKES_MEMORYVIEW", False)
+    monkeypatch.setattr(pdf_source.fitz, "open", lambda stream, filetype: opened.append(type(stream)) or fitz_open(stream=stream, filetype=filetype))
+
+    pdf_file = Path(__file__).parent.parent / "Dataset" / "Challenge _1(a)" / "Datasets" / "Pdfs" / "E0H1CM114.pdf"
+    with pdf_source.PDFSource(pdf_file) as source:
+        doc = source.open_fitz()
+        assert doc.page_count == 14
+        doc.close()
+    assert opened == [bytes]
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Startup-time budget for main.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from startup_profile import startup_profile, total_ms, STARTUP_BUDGET_MS, HEAVY_MODULES
+
+def test_main_startup_is_light_and_within_budget():
+    """import main loads no PDF or numeric libraries and stays within the budget"""
+    main_timings, round_timings = startup_profile(["src.process_pdfs"])
+    main_modules = {timing.module for timing in main_timings}
+    round_modules = {timing.module for timing in round_timings}
+
+    assert not main_modules & set(HEAVY_MODULES)
+    assert total_ms(main_timings) <= STARTUP_BUDGET_MS
+
+    # Round 1A loads PyMuPDF but not the PyPDF2 fallback or Round 1B
+    assert "fitz" in round_modules
+    assert "PyPDF2" not in round_modules
+    assert "src.persona_intelligence" not in round_modules